@@ -0,0 +1,413 @@
+"""Shared column catalog used by the 1-python tools.
+
+Loads the aggregated ``0-data/index.csv`` or a per-database ``columns.csv``
+export into a compact, column-oriented structure:
+
+- every distinct string is stored once in a ``StringPool`` together with its
+  lower-cased form, so case-insensitive sorting and searching never call
+  ``str.lower()`` per row;
+- rows are kept as parallel ``array('I')`` columns of string ids
+  (source, schema, table, column, data type, max length, nullable).
+
+``load_index`` keeps a pickled copy of the sorted catalog next to the CSV
+(``index.csv.cache``). It is reused while the CSV's size and modification time
+match, or its SHA-1 when only the timestamp changed, and rebuilt otherwise.
+
+Field layout follows index.csv: SOURCE_SCHEMA, TABLE_SCHEMA, TABLE_NAME,
+COLUMN_NAME, DATA_TYPE, CHARACTER_MAXIMUM_LENGTH, IS_NULLABLE. Rows read from a
+columns.csv get the database folder name as their SOURCE_SCHEMA. Fields beyond
+these seven are only kept by catalogs created with ``keep_extra`` (as
+refresh_index does, so index.csv carries every column of columns.csv).
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import itertools
+import operator
+import os
+import pickle
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+INDEX_FIELDS = (
+    'SOURCE_SCHEMA',
+    'TABLE_SCHEMA',
+    'TABLE_NAME',
+    'COLUMN_NAME',
+    'DATA_TYPE',
+    'CHARACTER_MAXIMUM_LENGTH',
+    'IS_NULLABLE',
+)
+SOURCE, SCHEMA, TABLE, COLUMN, DATA_TYPE, MAX_LENGTH, NULLABLE = range(len(INDEX_FIELDS))
+
+# Upper-cased first cells that can start a header row (INFORMATION_SCHEMA.COLUMNS
+# exports begin with TABLE_CATALOG); only such rows get the full header check
+HEADER_CELLS = frozenset(INDEX_FIELDS + ('TABLE_CATALOG',))
+# Rows transposed at once by ColumnCatalog.extend
+EXTEND_CHUNK_ROWS = 256
+# Widest row a keep_extra catalog stores (widths are kept as unsigned bytes)
+MAX_FIELDS = 255
+
+# Bump when the pickled layout of cached objects changes
+CACHE_VERSION = 3
+
+
+def detect_delimiter(first_line: str) -> str:
+    """Heuristically determine whether the file is comma or tab delimited."""
+    comma_count = first_line.count(',')
+    tab_count = first_line.count('\t')
+    if tab_count and not comma_count:
+        return '\t'
+    if comma_count and not tab_count:
+        return ','
+    if tab_count >= comma_count:
+        return '\t'
+    return ','
+
+
+def iter_csv_rows(path: str) -> Iterator[List[str]]:
+    """Yield whitespace-stripped rows of a comma or tab delimited file."""
+    with open(path, encoding='utf-8', errors='replace', newline='') as handle:
+        first_line = handle.readline()
+        if not first_line:
+            return
+        delimiter = detect_delimiter(first_line)
+        handle.seek(0)
+
+        reader = csv.reader(handle, delimiter=delimiter, skipinitialspace=True)
+        for raw_row in reader:
+            yield list(map(str.strip, raw_row))
+
+
+class StringPool:
+    """Interns strings to integer ids and keeps their lower-cased form."""
+
+    def __init__(self) -> None:
+        self.strings: List[str] = ['']
+        self.lowered: List[str] = ['']
+        self._ids: Optional[Dict[str, int]] = {'': 0}
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The id lookup is derived from strings; rebuild it lazily after loading
+        return {'strings': self.strings, 'lowered': self.lowered}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.strings = state['strings']
+        self.lowered = state['lowered']
+        self._ids = None
+
+    def _id_map(self) -> Dict[str, int]:
+        if self._ids is None:
+            self._ids = {value: string_id for string_id, value in enumerate(self.strings)}
+        return self._ids
+
+    def intern(self, value: str) -> int:
+        """Return the id of value, adding it to the pool if needed."""
+        ids = self._id_map()
+        string_id = ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            ids[value] = string_id
+            self.strings.append(value)
+            self.lowered.append(value.lower())
+        return string_id
+
+    def lookup(self, value: str) -> Optional[int]:
+        """Return the id of value, or None if it was never interned."""
+        return self._id_map().get(value)
+
+
+class ColumnCatalog:
+    """Column metadata stored as parallel arrays of interned string ids.
+
+    Rows are cut to the INDEX_FIELDS layout unless keep_extra is set; then a
+    field array is added whenever a wider row arrives (up to MAX_FIELDS).
+    """
+
+    def __init__(self, pool: Optional[StringPool] = None, keep_extra: bool = False) -> None:
+        self.pool = pool if pool is not None else StringPool()
+        self.fields: Tuple[array, ...] = tuple(array('I') for _ in INDEX_FIELDS)
+        self.widths = array('B')  # number of fields present in each source row
+        self.header: Optional[List[str]] = None
+        self.keep_extra = keep_extra
+
+    def __len__(self) -> int:
+        return len(self.widths)
+
+    @property
+    def max_width(self) -> int:
+        """Number of leading fields of a row that are stored."""
+        return MAX_FIELDS if self.keep_extra else len(INDEX_FIELDS)
+
+    def _add_fields(self, width: int) -> None:
+        """Grow the field arrays to width, padding existing rows with the empty string."""
+        self.fields += tuple(array('I', [0]) * len(self) for _ in range(width - len(self.fields)))
+
+    def append(self, values: Sequence[str]) -> None:
+        """Add one row given as (source, schema, table, column, ...) strings."""
+        width = min(len(values), self.max_width)
+        if width > len(self.fields):
+            self._add_fields(width)
+        intern = self.pool.intern
+        for position, field in enumerate(self.fields):
+            field.append(intern(values[position]) if position < width else 0)
+        self.widths.append(width)
+
+    def extend(self, rows: Iterable[Sequence[str]]) -> None:
+        """Add many rows like append(), interning a chunk of rows column by column.
+
+        Rows are transposed in chunks of EXTEND_CHUNK_ROWS, so each field is
+        looked up in the pool's dict with one map() call instead of one
+        intern() call per field and row.
+        """
+        pool = self.pool
+        ids = pool._id_map()
+        lookup = ids.get
+        strings = pool.strings
+        lowered = pool.lowered
+        max_width = self.max_width
+        rows = iter(rows)
+
+        while True:
+            chunk = list(itertools.islice(rows, EXTEND_CHUNK_ROWS))
+            if not chunk:
+                return
+            columns = list(itertools.islice(itertools.zip_longest(*chunk, fillvalue=''), max_width))
+            if len(columns) > len(self.fields):
+                self._add_fields(len(columns))
+            for field, column in itertools.zip_longest(self.fields, columns):
+                if column is None:
+                    field.extend(itertools.repeat(0, len(chunk)))
+                    continue
+                column_ids = list(map(lookup, column))
+                if None in column_ids:
+                    new_values = list(itertools.filterfalse(ids.__contains__, dict.fromkeys(column)))
+                    ids.update(zip(new_values, range(len(strings), len(strings) + len(new_values))))
+                    strings.extend(new_values)
+                    lowered.extend(map(str.lower, new_values))
+                    column_ids = list(map(ids.__getitem__, column))
+                field.extend(column_ids)
+
+            widths = list(map(len, chunk))
+            if max(widths) > max_width:
+                widths = [min(width, max_width) for width in widths]
+            self.widths.extend(widths)
+
+    def value(self, row: int, field: int) -> str:
+        """Return a single field of a row."""
+        return self.pool.strings[self.fields[field][row]]
+
+    def entry(self, row: int) -> Tuple[str, str, str, str]:
+        """Return (source, schema, table, column) of a row."""
+        strings = self.pool.strings
+        return (
+            strings[self.fields[SOURCE][row]],
+            strings[self.fields[SCHEMA][row]],
+            strings[self.fields[TABLE][row]],
+            strings[self.fields[COLUMN][row]],
+        )
+
+    def entries(self) -> Iterator[Tuple[str, str, str, str]]:
+        """Iterate (source, schema, table, column) tuples in catalog order."""
+        strings = self.pool.strings
+        for source_id, schema_id, table_id, column_id in zip(*self.fields[:COLUMN + 1]):
+            yield strings[source_id], strings[schema_id], strings[table_id], strings[column_id]
+
+    def record(self, row: int) -> Tuple[str, ...]:
+        """Return every field present in the source row."""
+        strings = self.pool.strings
+        return tuple(strings[field[row]] for field in self.fields[:self.widths[row]])
+
+    def records(self) -> Iterator[Tuple[str, ...]]:
+        """Iterate full rows in catalog order."""
+        field_count = len(self.fields)
+        rows = zip(*(map(self.pool.strings.__getitem__, field) for field in self.fields))
+        if self.widths.count(field_count) == len(self):
+            return rows
+        return (values if width == field_count else values[:width] for values, width in zip(rows, self.widths))
+
+    def _reorder(self, order: Sequence[int]) -> None:
+        """Rearrange all row arrays into the given row order."""
+        self.fields = tuple(array('I', map(field.__getitem__, order)) for field in self.fields)
+        self.widths = array('B', map(self.widths.__getitem__, order))
+
+    def sort(self) -> None:
+        """Sort rows case-insensitively by source, schema, table and column (stable)."""
+        lowered = self.pool.lowered
+        distinct = sorted(set(lowered))
+        rank_of = {value: rank for rank, value in enumerate(distinct)}
+        ranks = [rank_of[value] for value in lowered]
+
+        keys = list(zip(*(map(ranks.__getitem__, field) for field in self.fields[:COLUMN + 1])))
+        self._reorder(sorted(range(len(self)), key=keys.__getitem__))
+
+    def row_range(self, *prefix: str) -> Tuple[int, int]:
+        """Rows [start, stop) whose leading fields equal prefix (source, schema, table), ignoring case.
+
+        Bisects the pre-lowered strings, so the catalog must be in sort() order.
+        """
+        lowered = self.pool.lowered
+        fields = self.fields[:len(prefix)]
+        target = tuple(value.lower() for value in prefix)
+
+        def key(row: int) -> Tuple[str, ...]:
+            return tuple(lowered[field[row]] for field in fields)
+
+        rows = range(len(self))
+        return bisect_left(rows, target, key=key), bisect_right(rows, target, key=key)
+
+    def sort_unique(self) -> None:
+        """Sort rows by their exact field values and drop duplicate rows."""
+        strings = self.pool.strings
+        ranks = [0] * len(strings)
+        for rank, string_id in enumerate(sorted(range(len(strings)), key=strings.__getitem__)):
+            ranks[string_id] = rank
+        keys = list(zip(*(map(ranks.__getitem__, field) for field in self.fields), self.widths))
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+
+        # Keep a row only if its key differs from the one sorted before it
+        sorted_keys = list(map(keys.__getitem__, order))
+        self._reorder(list(itertools.compress(order, map(operator.ne, sorted_keys, [None] + sorted_keys[:-1]))))
+
+
+def file_digest(path: str) -> str:
+    """Return the SHA-1 hex digest of a file, read in 1 MiB blocks."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_cached(source_path: str, cache_path: str, build: Callable[[], Any], kind: str) -> Any:
+    """Return build() for source_path, cached as a pickle in cache_path.
+
+    The cache is keyed on the source file's size, modification time and
+    SHA-1. A matching size and mtime is trusted without hashing; if only the
+    mtime differs the hash decides whether the cached object is still valid.
+    Failing to read or write the cache just falls back to build().
+    """
+    stat = os.stat(source_path)
+    cached = None
+    try:
+        with open(cache_path, 'rb') as handle:
+            cached = pickle.load(handle)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+        cached = None
+
+    digest = None
+    if isinstance(cached, dict) and cached.get('version') == CACHE_VERSION and cached.get('kind') == kind:
+        if cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['data']
+        if cached['size'] == stat.st_size:
+            digest = file_digest(source_path)
+            if digest == cached['sha1']:
+                cached['mtime_ns'] = stat.st_mtime_ns
+                _write_cache(cache_path, cached)
+                return cached['data']
+
+    data = build()
+    _write_cache(cache_path, {
+        'version': CACHE_VERSION,
+        'kind': kind,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha1': digest or file_digest(source_path),
+        'data': data,
+    })
+    return data
+
+
+def _write_cache(cache_path: str, payload: Dict[str, Any]) -> None:
+    """Atomically replace the cache file; errors are ignored (the cache is optional)."""
+    temp_path = f'{cache_path}.{os.getpid()}.tmp'
+    try:
+        with open(temp_path, 'wb') as handle:
+            pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def _is_header(row: Sequence[str], required: set) -> bool:
+    return required.issubset({cell.upper() for cell in row})
+
+
+def load_index(index_path: str, use_cache: bool = True) -> ColumnCatalog:
+    """Load index.csv, keeping rows with source, schema, table and column, sorted case-insensitively.
+
+    With use_cache the parsed catalog is stored in (and served from)
+    ``<index_path>.cache``.
+    """
+    if not os.path.exists(index_path):
+        return ColumnCatalog()
+    if use_cache:
+        return load_cached(index_path, f'{index_path}.cache', lambda: _parse_index(index_path), 'index')
+    return _parse_index(index_path)
+
+
+def _parse_index(index_path: str) -> ColumnCatalog:
+    catalog = ColumnCatalog()
+
+    rows = iter_csv_rows(index_path)
+    first_row = next(rows, None)
+    if first_row is not None and _is_header(first_row, set(INDEX_FIELDS[:COLUMN + 1])):
+        catalog.header = first_row[:catalog.max_width]
+    elif first_row is not None:
+        rows = itertools.chain([first_row], rows)
+
+    catalog.extend(row for row in rows if len(row) >= 4 and row[0] and row[1] and row[2] and row[3])
+    catalog.sort()
+    return catalog
+
+
+def iter_columns_csv(path: str, source: str) -> Iterator[Tuple[bool, List[str]]]:
+    """Yield (is_header, row) for a per-database columns.csv, rows prefixed with source.
+
+    Header rows (TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ...) are yielded with
+    SOURCE_SCHEMA as their first cell. Data rows without schema, table and
+    column are skipped; all other rows keep every field.
+    """
+    required = set(INDEX_FIELDS[SCHEMA:COLUMN + 1])
+    for row in iter_csv_rows(path):
+        if not any(row):
+            continue
+        first_cell = row[0].upper()
+        if first_cell in HEADER_CELLS and (first_cell == 'TABLE_SCHEMA' or _is_header(row, required)):
+            yield True, ['SOURCE_SCHEMA'] + row
+            continue
+        if len(row) < 3 or not (row[0] and row[1] and row[2]):
+            continue
+        yield False, [source] + row
+
+
+def load_columns_csv(path: str, source: str, catalog: Optional[ColumnCatalog] = None) -> ColumnCatalog:
+    """Append the rows of a per-database columns.csv to a catalog (created if not given).
+
+    The first header row seen is stored as the catalog header, cut to the
+    fields the catalog keeps like the rows. Rows are appended in file order;
+    call sort() or sort_unique() as needed.
+    """
+    if catalog is None:
+        catalog = ColumnCatalog()
+    if not os.path.exists(path):
+        return catalog
+
+    def data_rows() -> Iterator[List[str]]:
+        for is_header, row in iter_columns_csv(path, source):
+            if not is_header:
+                yield row
+            elif catalog.header is None:
+                catalog.header = row[:catalog.max_width]
+
+    catalog.extend(data_rows())
+    return catalog
@@ -0,0 +1,313 @@
+"""Search indexes over the column names of a ColumnCatalog.
+
+All indexes work on the distinct lower-cased column names of the catalog and
+map every name to the catalog rows carrying it, so a lookup only touches the
+names that can match and returns rows in catalog order.
+
+- ``TrigramIndex``: case-insensitive substring search. Every name is split
+  into overlapping 3-character grams; a query intersects the posting lists of
+  its own trigrams and verifies the few surviving names.
+- ``FuzzyIndex``: typo-tolerant lookup in the style of SymSpell. Every name
+  prefix is stored under all its variants with up to ``max_distance``
+  characters deleted; a query generates its own deletes, collects the names
+  sharing one and ranks them by optimal string alignment distance.
+- ``TokenIndex``: word search. Names are split into CamelCase, snake_case
+  and digit tokens; every query token is prefix-matched against the sorted
+  token vocabulary, the posting lists are intersected and the names ranked
+  by relevance.
+
+Indexes are cached next to index.csv with ``column_catalog.load_cached`` and
+rebuilt whenever index.csv changes.
+"""
+
+from __future__ import annotations
+
+import re
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from column_catalog import COLUMN, ColumnCatalog, load_cached
+
+
+class ColumnNameIndex:
+    """Distinct lower-cased column names and the catalog rows using each of them."""
+
+    def __init__(self, catalog: ColumnCatalog) -> None:
+        self.names: List[str] = []
+        self.name_rows: List[array] = []
+        name_ids: Dict[str, int] = {}
+        lowered = catalog.pool.lowered
+        for row, column_id in enumerate(catalog.fields[COLUMN]):
+            name = lowered[column_id]
+            name_id = name_ids.get(name)
+            if name_id is None:
+                name_id = len(self.names)
+                name_ids[name] = name_id
+                self.names.append(name)
+                self.name_rows.append(array('I'))
+            self.name_rows[name_id].append(row)
+
+    def rows_for(self, name_ids: Sequence[int]) -> List[int]:
+        """Return the catalog rows of the given names, in catalog order."""
+        rows: List[int] = []
+        for name_id in name_ids:
+            rows.extend(self.name_rows[name_id])
+        rows.sort()
+        return rows
+
+
+def trigrams(text: str) -> set:
+    """Return the set of overlapping 3-character substrings of text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex(ColumnNameIndex):
+    """Trigram inverted index for case-insensitive substring search on column names."""
+
+    def __init__(self, catalog: ColumnCatalog) -> None:
+        super().__init__(catalog)
+        self.postings: Dict[str, array] = {}
+        for name_id, name in enumerate(self.names):
+            for gram in trigrams(name):
+                posting = self.postings.get(gram)
+                if posting is None:
+                    posting = self.postings[gram] = array('I')
+                posting.append(name_id)  # name ids grow, so postings stay sorted
+
+    def matching_names(self, fragment: str) -> List[int]:
+        """Return ids of the names containing fragment (case insensitive), ascending."""
+        fragment = fragment.lower()
+        if len(fragment) < 3:
+            # Too short for trigrams: the distinct names are still far fewer than rows
+            return [name_id for name_id, name in enumerate(self.names) if fragment in name]
+
+        postings = []
+        for gram in trigrams(fragment):
+            posting = self.postings.get(gram)
+            if not posting:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+
+        smallest, others = postings[0], postings[1:]
+        names = self.names
+        matches = []
+        for name_id in smallest:
+            for posting in others:
+                position = bisect_left(posting, name_id)
+                if position == len(posting) or posting[position] != name_id:
+                    break
+            else:
+                # All trigrams present; confirm the fragment really occurs in order
+                if fragment in names[name_id]:
+                    matches.append(name_id)
+        return matches
+
+    def search(self, fragment: str) -> List[int]:
+        """Return the catalog rows whose column name contains fragment, in catalog order."""
+        return self.rows_for(self.matching_names(fragment))
+
+
+def osa_distance(source: str, target: str, max_distance: int) -> int:
+    """Optimal string alignment distance (adjacent transpositions count as one edit).
+
+    Only the diagonal band of width 2 * max_distance + 1 is evaluated, and
+    max_distance + 1 is returned as soon as the distance is known to exceed it.
+    """
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+    if source == target:
+        return 0
+
+    over = max_distance + 1
+    width = len(target)
+    previous_previous: List[int] = []
+    previous = [j if j <= max_distance else over for j in range(width + 1)]
+    for i, source_char in enumerate(source, 1):
+        low = max(1, i - max_distance)
+        high = min(width, i + max_distance)
+        current = [over] * (width + 1)
+        if i <= max_distance:
+            current[0] = i
+        row_min = current[0]
+        for j in range(low, high + 1):
+            target_char = target[j - 1]
+            value = previous[j - 1] + (source_char != target_char)
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if (i > 1 and j > 1 and source_char == target[j - 2] and source[i - 2] == target_char
+                    and previous_previous[j - 2] + 1 < value):
+                value = previous_previous[j - 2] + 1
+            current[j] = value if value < over else over
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return over
+        previous_previous, previous = previous, current
+    return previous[width]
+
+
+def deletes(text: str, max_distance: int) -> Set[str]:
+    """Return text and every string obtained by deleting up to max_distance characters."""
+    variants = {text}
+    frontier = {text}
+    for _ in range(max_distance):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))} - variants
+        variants |= frontier
+    return variants
+
+
+class FuzzyIndex(ColumnNameIndex):
+    """SymSpell-style deletion index for ranked, typo-tolerant column-name lookup."""
+
+    def __init__(self, catalog: ColumnCatalog, max_distance: int = 2, prefix_length: int = 7) -> None:
+        super().__init__(catalog)
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.deletes: Dict[str, array] = {}
+        for name_id, name in enumerate(self.names):
+            for variant in deletes(name[:prefix_length], max_distance):
+                posting = self.deletes.get(variant)
+                if posting is None:
+                    posting = self.deletes[variant] = array('I')
+                posting.append(name_id)
+
+    def similar_names(self, term: str, top_k: int = 10) -> List[Tuple[int, int]]:
+        """Return up to top_k (distance, name id) pairs closest to term, best first.
+
+        Ties on distance are broken by name length difference, then by name.
+        """
+        term = term.lower()
+        max_distance = self.max_distance
+        candidates: Set[int] = set()
+        for variant in deletes(term[:self.prefix_length], max_distance):
+            posting = self.deletes.get(variant)
+            if posting:
+                candidates.update(posting)
+
+        names = self.names
+        ranked = []
+        for name_id in candidates:
+            distance = osa_distance(term, names[name_id], max_distance)
+            if distance <= max_distance:
+                ranked.append((distance, abs(len(names[name_id]) - len(term)), names[name_id], name_id))
+        ranked.sort()
+        return [(distance, name_id) for distance, _, _, name_id in ranked[:top_k]]
+
+    def search(self, term: str, top_k: int = 10) -> List[Tuple[int, List[int]]]:
+        """Return (distance, catalog rows) for the top_k column names closest to term."""
+        return [(distance, list(self.name_rows[name_id])) for distance, name_id in self.similar_names(term, top_k)]
+
+
+WORD_RUN = re.compile(r'[^\W\d_]+|\d+')
+
+
+def split_tokens(name: str) -> List[str]:
+    """Split a column name into lower-cased CamelCase, snake_case and digit tokens.
+
+    ``ProcessStepID`` -> process, step, id; ``HTTPServer_2`` -> http, server, 2.
+    """
+    tokens = []
+    for run in WORD_RUN.findall(name):
+        if run.isdigit():
+            tokens.append(run)
+            continue
+        start = 0
+        for i in range(1, len(run)):
+            previous, current = run[i - 1], run[i]
+            following = run[i + 1] if i + 1 < len(run) else ''
+            # Split before an upper-case letter that follows a lower-case one
+            # and before the last capital of an acronym followed by lower case
+            if (previous.islower() and current.isupper()) or (
+                    previous.isupper() and current.isupper() and following.islower()):
+                tokens.append(run[start:i])
+                start = i
+        tokens.append(run[start:])
+    return [token.lower() for token in tokens]
+
+
+class TokenIndex(ColumnNameIndex):
+    """Token inverted index for ranked word search on CamelCase / snake_case column names."""
+
+    def __init__(self, catalog: ColumnCatalog) -> None:
+        super().__init__(catalog)
+        name_ids = {name: name_id for name_id, name in enumerate(self.names)}
+        self.name_tokens: List[Tuple[str, ...]] = [()] * len(self.names)
+
+        # Tokens depend on the original casing; use the first spelling of each name
+        strings = catalog.pool.strings
+        lowered = catalog.pool.lowered
+        for column_id in catalog.fields[COLUMN]:
+            name_id = name_ids[lowered[column_id]]
+            if not self.name_tokens[name_id]:
+                self.name_tokens[name_id] = tuple(split_tokens(strings[column_id]))
+
+        postings: Dict[str, array] = {}
+        for name_id, tokens in enumerate(self.name_tokens):
+            for token in set(tokens):
+                posting = postings.get(token)
+                if posting is None:
+                    posting = postings[token] = array('I')
+                posting.append(name_id)
+        self.vocabulary: List[str] = sorted(postings)
+        self.postings: List[array] = [postings[token] for token in self.vocabulary]
+
+    def _prefix_matches(self, prefix: str) -> Set[int]:
+        """Return ids of the names having a token that starts with prefix."""
+        vocabulary = self.vocabulary
+        matches: Set[int] = set()
+        position = bisect_left(vocabulary, prefix)
+        while position < len(vocabulary) and vocabulary[position].startswith(prefix):
+            matches.update(self.postings[position])
+            position += 1
+        return matches
+
+    def _rank_key(self, name_id: int, query: List[str]) -> Tuple[int, bool, int, int, str]:
+        tokens = self.name_tokens[name_id]
+        exact = sum(1 for token in query if token in tokens)
+        width = len(query)
+        in_order = any(
+            all(tokens[start + offset].startswith(token) for offset, token in enumerate(query))
+            for start in range(len(tokens) - width + 1)
+        )
+        name = self.names[name_id]
+        # More whole-token hits, query as a contiguous phrase, fewer extra tokens, shorter name
+        return -exact, not in_order, len(tokens) - width, len(name), name
+
+    def matching_names(self, query: str, top_k: Optional[int] = None) -> List[int]:
+        """Return ids of the names containing every query token (as a token prefix), best first."""
+        query_tokens = split_tokens(query)
+        if not query_tokens:
+            return []
+
+        candidates: Optional[Set[int]] = None
+        for token in sorted(set(query_tokens), key=len, reverse=True):
+            matches = self._prefix_matches(token)
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+
+        ranked = sorted(candidates, key=lambda name_id: self._rank_key(name_id, query_tokens))
+        return ranked if top_k is None else ranked[:top_k]
+
+    def search(self, query: str, top_k: Optional[int] = None) -> List[List[int]]:
+        """Return the catalog rows of the top_k best matching column names, best name first."""
+        return [list(self.name_rows[name_id]) for name_id in self.matching_names(query, top_k)]
+
+
+def load_trigram_index(index_path: str, catalog: ColumnCatalog) -> TrigramIndex:
+    """Return the trigram index for catalog, cached in ``<index_path>.trigram.cache``."""
+    return load_cached(index_path, f'{index_path}.trigram.cache', lambda: TrigramIndex(catalog), 'trigram')
+
+
+def load_fuzzy_index(index_path: str, catalog: ColumnCatalog) -> FuzzyIndex:
+    """Return the fuzzy index for catalog, cached in ``<index_path>.fuzzy.cache``."""
+    return load_cached(index_path, f'{index_path}.fuzzy.cache', lambda: FuzzyIndex(catalog), 'fuzzy')
+
+
+def load_token_index(index_path: str, catalog: ColumnCatalog) -> TokenIndex:
+    """Return the token index for catalog, cached in ``<index_path>.token.cache``."""
+    return load_cached(index_path, f'{index_path}.token.cache', lambda: TokenIndex(catalog), 'token')
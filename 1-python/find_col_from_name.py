@@ -1,70 +1,27 @@
 #!/usr/bin/env python3
-"""Search columns by name fragment across all indexed databases."""
+"""Search columns by name fragment across all indexed databases.
 
+Without arguments the script asks for one search string. Passing search terms
+(or --file with one term per line, '-' for stdin) answers all of them in one
+run against a single loaded index and writes JSON Lines or CSV to stdout.
+"""
+
+import argparse
+import csv
+import json
 import os
 import sys
-import csv
-from typing import List, Tuple
-
-
-def _detect_delimiter(first_line: str) -> str:
-    """Heuristically determine whether the file is comma or tab delimited."""
-    comma_count = first_line.count(',')
-    tab_count = first_line.count('\t')
-    if tab_count and not comma_count:
-        return '\t'
-    if comma_count and not tab_count:
-        return ','
-    if tab_count >= comma_count:
-        return '\t'
-    return ','
-
-
-def read_index(index_path: str) -> List[Tuple[str, str, str, str]]:
-    """Load (source, schema, table, column) tuples from the aggregated index."""
-    if not os.path.exists(index_path):
-        return []
-
-    with open(index_path, encoding='utf-8', errors='replace', newline='') as handle:
-        first_line = handle.readline()
-        if not first_line:
-            return []
-        delimiter = _detect_delimiter(first_line)
-        handle.seek(0)
-
-        reader = csv.reader(handle, delimiter=delimiter, skipinitialspace=True)
-        try:
-            header_row = next(reader)
-        except StopIteration:
-            return []
-
-        header_clean = [cell.strip().upper() for cell in header_row]
-        required_headers = {'SOURCE_SCHEMA', 'TABLE_SCHEMA', 'TABLE_NAME', 'COLUMN_NAME'}
-        has_header = required_headers.issubset(set(header_clean))
-
-        rows: List[List[str]] = []
-        if not has_header:
-            rows.append(header_row)
-
-        rows.extend(reader)
-
-    results: List[Tuple[str, str, str, str]] = []
-    for raw_row in rows:
-        row = [cell.strip() for cell in raw_row]
-        if len(row) < 4:
-            continue
-        source, schema, table, column = row[0], row[1], row[2], row[3]
-        if not source or not schema or not table or not column:
-            continue
-        results.append((source, schema, table, column))
-
-    results.sort(key=lambda entry: (
-        entry[0].lower(),
-        entry[1].lower(),
-        entry[2].lower(),
-        entry[3].lower(),
-    ))
-    return results
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from column_catalog import ColumnCatalog, load_index
+from column_search import (
+    FuzzyIndex, TokenIndex, TrigramIndex, load_fuzzy_index, load_token_index, load_trigram_index
+)
+
+
+def read_index(index_path: str) -> ColumnCatalog:
+    """Load the aggregated index as a column catalog (served from index.csv.cache when fresh)."""
+    return load_index(index_path)
 
 
 def prompt_search_string() -> str:
@@ -76,31 +33,181 @@ def prompt_search_string() -> str:
         print('Search string must not be empty.')
 
 
-def find_columns(columns: List[Tuple[str, str, str, str]], search: str) -> List[Tuple[str, str, str, str]]:
-    """Return columns whose name contains the search fragment (case insensitive)."""
-    search_lower = search.lower()
-    return [entry for entry in columns if search_lower in entry[3].lower()]
+def find_columns(
+    columns: ColumnCatalog, search: str, index: Optional[TrigramIndex] = None
+) -> List[Tuple[str, str, str, str]]:
+    """Return columns whose name contains the search fragment (case insensitive).
+
+    Pass a prebuilt (or cached) trigram index when searching repeatedly;
+    otherwise one is built for this call.
+    """
+    if index is None:
+        index = TrigramIndex(columns)
+    return [columns.entry(row) for row in index.search(search)]
+
+
+def find_similar_columns(
+    columns: ColumnCatalog, search: str, index: Optional[FuzzyIndex] = None, top_k: int = 10
+) -> List[Tuple[int, Tuple[str, str, str, str]]]:
+    """Return (edit distance, column) for the top_k column names closest to search, best first.
+
+    Tolerates up to two typos (insertions, deletions, substitutions or
+    adjacent transpositions); every column carrying a matched name is listed.
+    """
+    if index is None:
+        index = FuzzyIndex(columns)
+    return [
+        (distance, columns.entry(row))
+        for distance, rows in index.search(search, top_k)
+        for row in rows
+    ]
+
+
+def find_columns_by_tokens(
+    columns: ColumnCatalog, query: str, index: Optional[TokenIndex] = None, top_k: Optional[int] = None
+) -> List[Tuple[str, str, str, str]]:
+    """Return columns whose name contains every word of query, most relevant names first.
+
+    Names and query are split into CamelCase / snake_case / digit tokens, so
+    'order id' and 'OrderID' both find ProductionOrderID. Each query token
+    may be a prefix of a name token ('step' also matches StepsDone).
+    """
+    if index is None:
+        index = TokenIndex(columns)
+    return [columns.entry(row) for rows in index.search(query, top_k) for row in rows]
+
+
+SEARCH_MODES = ('substring', 'token', 'fuzzy')
+OUTPUT_FIELDS = ('term', 'source', 'schema', 'table', 'column', 'distance')
+
+
+def read_terms(path: str) -> Iterator[str]:
+    """Yield the non-empty, stripped lines of a file ('-' reads stdin)."""
+    handle = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        for line in handle:
+            term = line.strip()
+            if term:
+                yield term
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def search_many(
+    columns: ColumnCatalog, terms: Iterable[str], index_path: Optional[str] = None,
+    mode: str = 'substring', top_k: int = 10
+) -> Iterator[Tuple[str, List[Dict[str, object]]]]:
+    """Answer many searches against one catalog; yields (term, matches) per term.
+
+    Each match is a dict with source, schema, table, column and, for fuzzy
+    searches, the edit distance. Token and fuzzy searches return the top_k
+    best column names. With index_path the search index is loaded
+    from (or stored to) its cache next to index.csv.
+    """
+    if mode == 'fuzzy':
+        index = load_fuzzy_index(index_path, columns) if index_path else FuzzyIndex(columns)
+    elif mode == 'token':
+        index = load_token_index(index_path, columns) if index_path else TokenIndex(columns)
+    else:
+        index = load_trigram_index(index_path, columns) if index_path else TrigramIndex(columns)
+
+    for term in terms:
+        if mode == 'fuzzy':
+            found = find_similar_columns(columns, term, index, top_k)
+        elif mode == 'token':
+            found = [(None, entry) for entry in find_columns_by_tokens(columns, term, index, top_k)]
+        else:
+            found = [(None, entry) for entry in find_columns(columns, term, index)]
+        yield term, [
+            {'source': source, 'schema': schema, 'table': table, 'column': column, 'distance': distance}
+            for distance, (source, schema, table, column) in found
+        ]
+
+
+def write_results(results: Iterable[Tuple[str, List[Dict[str, object]]]], output_format: str) -> None:
+    """Write search results to stdout as JSON Lines (one line per term) or CSV (one row per match)."""
+    if output_format == 'csv':
+        writer = csv.writer(sys.stdout)
+        writer.writerow(OUTPUT_FIELDS)
+        for term, matches in results:
+            for match in matches:
+                writer.writerow([term] + ['' if match[field] is None else match[field] for field in OUTPUT_FIELDS[1:]])
+        return
+
+    for term, matches in results:
+        sys.stdout.write(json.dumps({'term': term, 'matches': matches}, ensure_ascii=False) + '\n')
+
+
+def interactive_search(columns: ColumnCatalog, index_path: str, mode: str = 'substring', top_k: int = 10) -> None:
+    """Ask for one search string and print the matching columns (or the closest names).
+
+    Token and fuzzy modes print their top_k ranked column names; substring
+    mode falls back to the top_k closest names when nothing contains the term.
+    """
+    search = prompt_search_string()
+    if mode != 'substring':
+        _, ranked = next(search_many(columns, [search], index_path, mode, top_k))
+        if not ranked:
+            print(f'No columns found for "{search}".')
+            sys.exit(0)
+        print(f'\nBest {mode} matches for "{search}":')
+        for idx, match in enumerate(ranked, 1):
+            distance = '' if match['distance'] is None else f" (distance {match['distance']})"
+            print(f"{idx}. {match['source']}.{match['schema']}.{match['table']}.{match['column']}{distance}")
+        return
+
+    matches = find_columns(columns, search, load_trigram_index(index_path, columns))
+
+    if not matches:
+        print(f'No columns found containing "{search}".')
+        similar = find_similar_columns(columns, search, load_fuzzy_index(index_path, columns), top_k)
+        if not similar:
+            sys.exit(0)
+        print('\nClosest column names:')
+        for idx, (distance, (source, schema, table, column)) in enumerate(similar, 1):
+            print(f'{idx}. {source}.{schema}.{table}.{column} (distance {distance})')
+        sys.exit(0)
+
+    print(f'\nColumns containing "{search}":')
+    for idx, (source, schema, table, column) in enumerate(matches, 1):
+        print(f'{idx}. {source}.{schema}.{table}.{column}')
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description='Search columns by name across all indexed databases.')
+    parser.add_argument('terms', nargs='*', help='search terms; without terms or --file the script asks interactively')
+    parser.add_argument('--file', metavar='PATH', help="read one search term per line from PATH ('-' for stdin)")
+    parser.add_argument('--format', choices=('jsonl', 'csv'), default='jsonl', help='batch output format (default jsonl)')
+    parser.add_argument('--mode', choices=SEARCH_MODES, default='substring',
+                        help='substring match, ranked CamelCase/snake_case word match or '
+                             'typo-tolerant fuzzy match (default substring)')
+    parser.add_argument('--top-k', type=int, default=10, metavar='K',
+                        help='number of column names per token or fuzzy search (default 10)')
+    args = parser.parse_args()
+
+    terms = list(args.terms)
+    if args.file:
+        try:
+            terms.extend(read_terms(args.file))
+        except OSError as e:
+            parser.error(f'cannot read terms file {args.file}: {e.strerror or e}')
+        except UnicodeDecodeError as e:
+            parser.error(f'terms file {args.file} is not UTF-8 text: {e}')
+
     base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
     index_path = os.path.join(base_dir, '0-data', 'index.csv')
 
     columns = read_index(index_path)
-    if not columns:
-        print(f'No column metadata found in {index_path}.')
+    if not len(columns):
+        print(f'No column metadata found in {index_path}.', file=sys.stderr if args.terms or args.file else sys.stdout)
         sys.exit(1)
 
-    search = prompt_search_string()
-    matches = find_columns(columns, search)
+    if not args.terms and not args.file:
+        interactive_search(columns, index_path, args.mode, args.top_k)
+        return
 
-    if not matches:
-        print(f'No columns found containing "{search}".')
-        sys.exit(0)
-
-    print(f'\nColumns containing "{search}":')
-    for idx, (source, schema, table, column) in enumerate(matches, 1):
-        print(f'{idx}. {source}.{schema}.{table}.{column}')
+    write_results(search_many(columns, terms, index_path, args.mode, args.top_k), args.format)
 
 
 if __name__ == '__main__':
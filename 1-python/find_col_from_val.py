@@ -5,80 +5,84 @@ The script reads the aggregated column index (0-data/index.csv) to help the user
 select a database, schema, and table. It then adapts the seed template
 2-sql/find-ColumnName-containing-target-value.sql to the chosen table and
 search value, producing a ready-to-run T-SQL script.
+
+In schema or database scope one script scans every table that has searchable
+columns in the index, smallest tables first, with a per-table row cap.
+
+Columns are pruned by type: character columns shorter than the search value
+are skipped (per the index at generation time and per sys.columns at run
+time), and numeric, date/time or uniqueidentifier columns are only searched
+(by typed equality) when the search value parses as that type.
+
+Character columns are matched in one of four search modes: exact (=),
+prefix (LIKE 'value%'), contains (LIKE '%value%') or fulltext (CONTAINS on
+columns with a full-text index). Exact and prefix predicates are sargable,
+so together with the per-column cursor strategy they can use index seeks.
+
+Discovery mode only asks which columns contain the value: each column query
+stops after the first few matching rows, nothing is counted, and the scan can
+end once enough matching columns were found.
 """
 
 from __future__ import annotations
 
 import os
+import re
 import sys
-import csv
 import textwrap
+from datetime import datetime
+from decimal import Decimal
 from typing import Dict, Iterable, List, Optional, Tuple
 
+from column_catalog import COLUMN, DATA_TYPE, MAX_LENGTH, SCHEMA, TABLE, ColumnCatalog, load_index
+
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 INDEX_PATH = os.path.join(BASE_DIR, '0-data', 'index.csv')
 SEED_SQL_PATH = os.path.join(BASE_DIR, '2-sql', 'find-ColumnName-containing-target-value.sql')
 SQL_OUTPUT_DIR = os.path.join(BASE_DIR, '2-sql')
 
+# 'cursor' scans the table once per column; 'set' evaluates all columns in one pass
+SCAN_STRATEGIES = ('set', 'cursor')
+SAMPLES_PER_COLUMN = 5
+DEFAULT_DISCOVERY_ROWS = 1
+SEARCH_SCOPES = ('table', 'schema', 'database')
+CHARACTER_TYPES = ('char', 'nchar', 'varchar', 'nvarchar')
+INTEGER_RANGES = {
+    'tinyint': (0, 255),
+    'smallint': (-2 ** 15, 2 ** 15 - 1),
+    'int': (-2 ** 31, 2 ** 31 - 1),
+    'bigint': (-2 ** 63, 2 ** 63 - 1),
+}
+DECIMAL_TYPES = ('decimal', 'numeric', 'money', 'smallmoney', 'float', 'real')
+DATE_TYPES = ('date', 'smalldatetime', 'datetime', 'datetime2', 'datetimeoffset')
+GUID_TYPES = ('uniqueidentifier',)
+
+# Typed search values are compared as DECIMAL(38, 10), DATETIME2 and UNIQUEIDENTIFIER
+NUMBER_PATTERN = re.compile(r'^[+-]?(?:\d{1,28}(?:\.\d{0,10})?|\.\d{1,10})$')
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,7})?)?)?$')
+GUID_PATTERN = re.compile(r'^\{?[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}\}?$')
+
+SEARCH_MODES = ('contains', 'prefix', 'exact', 'fulltext')
+# Modes whose predicates can seek an index; they default to the per-column cursor strategy
+SARGABLE_MODES = ('prefix', 'exact', 'fulltext')
+
+# Parameters every generated scan statement receives
+SCAN_PARAMETERS = (
+    '@v NVARCHAR(200), @va VARCHAR(200), @p NVARCHAR(410), @pa VARCHAR(410), @ft NVARCHAR(410), '
+    '@n DECIMAL(38, 10), @d DATETIME2, @g UNIQUEIDENTIFIER'
+)
+SCAN_ARGUMENTS = (
+    '@v = @SearchValue, @va = @AnsiValue, @p = @Pattern, @pa = @AnsiPattern, @ft = @FullTextValue, '
+    '@n = @NumericValue, @d = @DateValue, @g = @GuidValue'
+)
+DEFAULT_ROW_CAP = 100000
+# SQL Server accepts at most 1000 rows per INSERT ... VALUES
+MAX_VALUES_ROWS = 1000
 
-def _detect_delimiter(first_line: str) -> str:
-    """Heuristically determine whether the CSV uses comma or tab delimiters."""
-    comma_count = first_line.count(',')
-    tab_count = first_line.count('\t')
-    if tab_count and not comma_count:
-        return '\t'
-    if comma_count and not tab_count:
-        return ','
-    if tab_count >= comma_count:
-        return '\t'
-    return ','
-
-
-def read_index(index_path: str) -> List[Tuple[str, str, str, str]]:
-    """Load (source, schema, table, column) tuples from index.csv."""
-    if not os.path.exists(index_path):
-        return []
-
-    with open(index_path, encoding='utf-8', errors='replace', newline='') as handle:
-        first_line = handle.readline()
-        if not first_line:
-            return []
-        delimiter = _detect_delimiter(first_line)
-        handle.seek(0)
-
-        reader = csv.reader(handle, delimiter=delimiter, skipinitialspace=True)
-        try:
-            header_row = next(reader)
-        except StopIteration:
-            return []
-
-        header_clean = [cell.strip().upper() for cell in header_row]
-        required_headers = {'SOURCE_SCHEMA', 'TABLE_SCHEMA', 'TABLE_NAME', 'COLUMN_NAME'}
-        has_header = required_headers.issubset(set(header_clean))
-
-        rows: List[List[str]] = []
-        if not has_header:
-            rows.append(header_row)
-
-        rows.extend(reader)
-
-    results: List[Tuple[str, str, str, str]] = []
-    for raw_row in rows:
-        row = [cell.strip() for cell in raw_row]
-        if len(row) < 4:
-            continue
-        source, schema, table, column = row[0], row[1], row[2], row[3]
-        if not source or not schema or not table or not column:
-            continue
-        results.append((source, schema, table, column))
 
-    results.sort(key=lambda entry: (
-        entry[0].lower(),
-        entry[1].lower(),
-        entry[2].lower(),
-        entry[3].lower(),
-    ))
-    return results
+def read_index(index_path: str) -> ColumnCatalog:
+    """Load index.csv as a column catalog (served from index.csv.cache when fresh)."""
+    return load_index(index_path)
 
 
 def build_table_index(entries: Iterable[Tuple[str, str, str, str]]) -> Dict[Tuple[str, str, str], List[str]]:
@@ -90,6 +94,119 @@ def build_table_index(entries: Iterable[Tuple[str, str, str, str]]) -> Dict[Tupl
     return table_map
 
 
+def searchable_types(search_value: str) -> List[str]:
+    """Return the SQL Server data types whose columns can contain search_value.
+
+    Character types always qualify (substring match). Integer types qualify
+    for whole numbers within their range, the other numeric types for any
+    number that fits DECIMAL(38, 10), date types for ISO dates / timestamps
+    within their range, and uniqueidentifier for GUIDs.
+    """
+    value = search_value.strip()
+    types = list(CHARACTER_TYPES)
+
+    if NUMBER_PATTERN.match(value):
+        number = Decimal(value)
+        if number == number.to_integral_value():
+            types.extend(name for name, (low, high) in INTEGER_RANGES.items() if low <= number <= high)
+        types.extend(DECIMAL_TYPES)
+
+    if DATE_PATTERN.match(value):
+        try:
+            moment = datetime.fromisoformat(value)
+        except ValueError:
+            moment = None
+        if moment is not None:
+            if moment.time() == datetime.min.time():
+                types.append('date')
+            if datetime(1900, 1, 1) <= moment <= datetime(2079, 6, 6, 23, 59):
+                types.append('smalldatetime')
+            if moment.year >= 1753:
+                types.append('datetime')
+            types.extend(('datetime2', 'datetimeoffset'))
+
+    if GUID_PATTERN.match(value):
+        types.extend(GUID_TYPES)
+    return types
+
+
+def infer_search_mode(search_value: str) -> Tuple[str, str]:
+    """Derive (mode, value) from wildcard markers in the raw search value.
+
+    '"value"' searches exactly, 'value*' by prefix and '*value*' or a plain
+    value anywhere in the column (contains).
+    """
+    value = search_value.strip()
+    if len(value) > 2 and value[0] == value[-1] == '"':
+        return 'exact', value[1:-1]
+    if len(value) > 2 and value[0] == '*' and value[-1] == '*':
+        return 'contains', value[1:-1]
+    if len(value) > 1 and value[-1] == '*' and value[0] != '*':
+        return 'prefix', value[:-1]
+    return 'contains', value
+
+
+def column_can_match(data_type: str, max_length: str, search_value: str, types: List[str]) -> bool:
+    """Decide from index metadata whether a column can contain search_value.
+
+    Unknown types or lengths are kept; the generated script re-checks them.
+    """
+    data_type = data_type.lower()
+    if not data_type:
+        return True
+    if data_type not in types:
+        return False
+    if data_type in CHARACTER_TYPES:
+        try:
+            length = int(max_length)
+        except ValueError:
+            return True
+        return length < 0 or length >= len(search_value)
+    return True
+
+
+def prune_table_columns(
+    catalog: ColumnCatalog, database: str, schema: str, table: str, search_value: str
+) -> List[str]:
+    """Return indexed character columns of one table that are too short to contain search_value."""
+    start, stop = catalog.row_range(database, schema, table)
+    strings = catalog.pool.strings
+    pruned = []
+    for column_id, type_id, length_id in zip(*(catalog.fields[field][start:stop]
+                                                for field in (COLUMN, DATA_TYPE, MAX_LENGTH))):
+        data_type = catalog.pool.lowered[type_id]
+        if data_type in CHARACTER_TYPES and not column_can_match(
+                data_type, strings[length_id], search_value, list(CHARACTER_TYPES)):
+            pruned.append(strings[column_id])
+    return pruned
+
+
+def build_search_column_index(
+    catalog: ColumnCatalog, database: str, schema: Optional[str], search_value: str
+) -> Dict[Tuple[str, str], List[str]]:
+    """Group the columns of one database (optionally one schema) that can contain search_value.
+
+    Keeps character columns long enough for the value and typed columns whose
+    type the value parses as (see searchable_types), grouped by (schema, table).
+    Only the catalog rows of the database (or schema) are visited, and each
+    distinct (type, length) pair is checked once.
+    """
+    types = searchable_types(search_value)
+    start, stop = catalog.row_range(database, schema) if schema else catalog.row_range(database)
+    strings = catalog.pool.strings
+    can_match: Dict[Tuple[int, int], bool] = {}
+    table_map: Dict[Tuple[str, str], List[str]] = {}
+    for schema_id, table_id, column_id, type_id, length_id in zip(
+            *(catalog.fields[field][start:stop] for field in (SCHEMA, TABLE, COLUMN, DATA_TYPE, MAX_LENGTH))):
+        keep = can_match.get((type_id, length_id))
+        if keep is None:
+            keep = can_match[type_id, length_id] = column_can_match(
+                strings[type_id], strings[length_id], search_value, types)
+        if keep:
+            table_map.setdefault((strings[schema_id], strings[table_id]), []).append(strings[column_id])
+    return table_map
+
+
 def format_table(key: Tuple[str, str, str]) -> str:
     source, schema, table = key
     return f"{source}.{schema}.{table}"
@@ -208,6 +325,83 @@ def sanitize_filename_component(component: str) -> str:
     return sanitized or 'value'
 
 
+def sql_name_list(names: Iterable[str]) -> str:
+    """Comma-separated N'...' literals."""
+    return ', '.join(f"N'{escape_sql_literal(name)}'" for name in names)
+
+
+def column_kind_sql(db_ident: str, mode: str) -> str:
+    """T-SQL expression classifying a column (aliases c, ty) as a #Cols ColumnKind.
+
+    Character columns are 'unicode' (nchar / nvarchar) or 'ansi' (char /
+    varchar) so each is compared with a parameter of its own type and index
+    seeks survive; in fulltext mode, full-text indexed columns become 'fulltext'.
+    """
+    fulltext = ''
+    if mode == 'fulltext':
+        fulltext = (
+            f"WHEN EXISTS (SELECT 1 FROM {db_ident}.sys.fulltext_index_columns AS fic "
+            "WHERE fic.object_id = c.object_id AND fic.column_id = c.column_id) THEN N'fulltext' "
+        )
+    return (
+        f"CASE {fulltext}WHEN ty.name IN (N'nchar', N'nvarchar') THEN N'unicode' "
+        "WHEN ty.name IN (N'char', N'varchar') THEN N'ansi' "
+        f"WHEN ty.name IN ({sql_name_list(DATE_TYPES)}) THEN N'date' "
+        f"WHEN ty.name IN ({sql_name_list(GUID_TYPES)}) THEN N'guid' "
+        "ELSE N'numeric' END"
+    )
+
+
+def column_filter_sql(search_value: str) -> List[str]:
+    """WHERE conditions (aliases c, ty) keeping only columns that can contain search_value.
+
+    The type list is decided at generation time from the search value; the
+    length check is the run-time safety net for character columns.
+    """
+    return [
+        f"ty.name IN ({sql_name_list(searchable_types(search_value))})",
+        f"(ty.name NOT IN ({sql_name_list(CHARACTER_TYPES)}) OR c.max_length = -1"
+        " OR c.max_length / CASE WHEN ty.name IN (N'nchar', N'nvarchar') THEN 2 ELSE 1 END >= LEN(@SearchValue))",
+    ]
+
+
+def predicate_sql(name_expression: str, kind_expression: str, mode: str, alias: str = '') -> str:
+    """T-SQL expression building the search predicate text for one #Cols column.
+
+    alias (e.g. 't.') qualifies the column inside the generated predicate.
+    """
+    column = f"N'{alias}' + QUOTENAME({name_expression})" if alias else f"QUOTENAME({name_expression})"
+    unicode_match, ansi_match = (" N' = @v'", " N' = @va'") if mode == 'exact' else (" N' LIKE @p'", " N' LIKE @pa'")
+    return (
+        f"CASE {kind_expression} WHEN N'fulltext' THEN N'CONTAINS(' + {column} + N', @ft)' "
+        f"ELSE {column} + CASE {kind_expression} WHEN N'unicode' THEN{unicode_match} WHEN N'ansi' THEN{ansi_match} "
+        "WHEN N'numeric' THEN N' = @n' WHEN N'date' THEN N' = @d' ELSE N' = @g' END END"
+    )
+
+
+def render_search_declarations(mode: str) -> str:
+    """Declare the match pattern and the typed forms of @SearchValue (NULL when not convertible).
+
+    LIKE wildcards in the value are escaped so it is always matched literally;
+    the VARCHAR forms are NULL when the value does not survive the conversion.
+    """
+    pattern = {
+        'exact': '@Literal',
+        'prefix': "@Literal + N'%'",
+    }.get(mode, "N'%' + @Literal + N'%'")
+    return textwrap.dedent(f"""
+        DECLARE @Literal       NVARCHAR(400)    = REPLACE(REPLACE(REPLACE(@SearchValue, N'[', N'[[]'), N'%', N'[%]'), N'_', N'[_]');
+        DECLARE @Pattern       NVARCHAR(410)    = {pattern};
+        DECLARE @AnsiValue     VARCHAR(200)     = CASE WHEN CAST(CAST(@SearchValue AS VARCHAR(200)) AS NVARCHAR(200)) = @SearchValue
+                                                       THEN CAST(@SearchValue AS VARCHAR(200)) END;
+        DECLARE @AnsiPattern   VARCHAR(410)     = CASE WHEN @AnsiValue IS NOT NULL THEN CAST(@Pattern AS VARCHAR(410)) END;
+        DECLARE @FullTextValue NVARCHAR(410)    = N'"' + REPLACE(@SearchValue, N'"', N'""') + N'"';
+        DECLARE @NumericValue  DECIMAL(38, 10)  = TRY_CAST(@SearchValue AS DECIMAL(38, 10));
+        DECLARE @DateValue     DATETIME2        = TRY_CAST(@SearchValue AS DATETIME2);
+        DECLARE @GuidValue     UNIQUEIDENTIFIER = TRY_CAST(@SearchValue AS UNIQUEIDENTIFIER);
+    """)
+
+
 def render_sql(
     database: str,
     schema: str,
@@ -215,8 +409,34 @@ def render_sql(
     search_value: str,
     row_filter: str,
     excluded_columns: List[str],
+    strategy: str = 'cursor',
+    pruned_columns: Optional[List[str]] = None,
+    mode: str = 'contains',
+    discovery_rows: int = 0,
+    max_hit_columns: int = 0,
 ) -> str:
-    """Build the final SQL script text."""
+    """Build the final SQL script text.
+
+    strategy 'cursor' runs IF EXISTS / COUNT / TOP per candidate column;
+    'set' unpivots all candidate columns with CROSS APPLY (VALUES ...) and
+    reads the table once (see render_set_scan). pruned_columns (see
+    prune_table_columns) are left out like excluded columns. mode is one of
+    SEARCH_MODES; fulltext needs the cursor strategy because CONTAINS is
+    only allowed in WHERE clauses.
+
+    With discovery_rows > 0 (cursor strategy only) each column query keeps
+    just its first discovery_rows matching rows and skips COUNT(*); MatchCount
+    then holds the number of rows found, at most discovery_rows. With
+    max_hit_columns > 0 the scan stops after that many matching columns.
+    """
+    if strategy not in SCAN_STRATEGIES:
+        raise ValueError(f'Unknown scan strategy: {strategy}')
+    if mode not in SEARCH_MODES:
+        raise ValueError(f'Unknown search mode: {mode}')
+    if mode == 'fulltext' and strategy != 'cursor':
+        raise ValueError('fulltext search requires the cursor strategy')
+    if discovery_rows > 0 and strategy != 'cursor':
+        raise ValueError('discovery mode requires the cursor strategy')
     db_ident = quote_identifier(database)
     schema_ident = quote_identifier(schema)
     table_ident = quote_identifier(table)
@@ -226,23 +446,29 @@ def render_sql(
     row_filter_expression = row_filter.strip() or '1 = 1'
     escaped_row_filter = escape_sql_literal(row_filter_expression)
 
-    exclusion_comment = ', '.join(excluded_columns) if excluded_columns else 'none'
-    if excluded_columns:
-        exclusion_literals = ', '.join(f"N'{escape_sql_literal(col)}'" for col in excluded_columns)
-        exclusion_clause = f"\n      AND  c.name NOT IN ({exclusion_literals})"
+    pruned_columns = pruned_columns or []
+    if discovery_rows > 0:
+        stop_comment = f'stop after {max_hit_columns} matching columns' if max_hit_columns > 0 else 'all columns'
+        discovery_comment = f'first {discovery_rows} matching rows per column, no counts, {stop_comment}'
     else:
-        exclusion_clause = ''
+        discovery_comment = 'off (full counts)'
+    exclusion_comment = ', '.join(excluded_columns) if excluded_columns else 'none'
+    pruned_comment = ', '.join(pruned_columns) if pruned_columns else 'none'
+    conditions = column_filter_sql(search_value)
+    if excluded_columns or pruned_columns:
+        conditions.append(f"c.name NOT IN ({sql_name_list(excluded_columns + pruned_columns)})")
+    filter_clause = ''.join(f"\n          AND  {condition}" for condition in conditions)
 
     column_scan = textwrap.dedent(f"""
-        INSERT INTO #Cols (ColumnName)
-        SELECT c.name
+        INSERT INTO #Cols (ColumnName, ColumnKind)
+        SELECT c.name, {column_kind_sql(db_ident, mode)}
         FROM   {db_ident}.sys.tables  AS t
         JOIN   {db_ident}.sys.schemas AS s  ON s.schema_id = t.schema_id
         JOIN   {db_ident}.sys.columns AS c  ON c.object_id = t.object_id
         JOIN   {db_ident}.sys.types   AS ty ON ty.user_type_id = c.user_type_id
         WHERE  s.name = N'{escape_sql_literal(schema)}'
-          AND  t.name = N'{escape_sql_literal(table)}'
-          AND  ty.name IN (N'char', N'nchar', N'varchar', N'nvarchar'){exclusion_clause};
+          AND  t.name = N'{escape_sql_literal(table)}'{filter_clause}
+        ORDER BY c.column_id;
     """)
 
     sql_body = textwrap.dedent(f"""
@@ -253,13 +479,22 @@ def render_sql(
         Search value: {search_value}
         Row filter: {row_filter_expression}
         Excluded columns: {exclusion_comment}
+        Pruned columns (shorter than the search value): {pruned_comment}
+        Searched types: {', '.join(searchable_types(search_value))}
+        Search mode: {mode}
+        Scan strategy: {strategy}
+        Discovery: {discovery_comment}
         */
         SET NOCOUNT ON;
 
         DECLARE @SearchValue NVARCHAR(200) = N'{escaped_search}';
 
         IF OBJECT_ID('tempdb..#Cols') IS NOT NULL DROP TABLE #Cols;
-        CREATE TABLE #Cols (ColumnName SYSNAME NOT NULL);
+        CREATE TABLE #Cols (
+            ColumnId   INT IDENTITY(1, 1) NOT NULL,
+            ColumnName SYSNAME            NOT NULL,
+            ColumnKind NVARCHAR(10)       NOT NULL
+        );
 
         IF OBJECT_ID('tempdb..#Hits') IS NOT NULL DROP TABLE #Hits;
         CREATE TABLE #Hits (
@@ -311,23 +546,25 @@ def render_sql(
 
     """)
 
-    cursor_block = textwrap.dedent(f"""
-        DECLARE @Col SYSNAME;
-        DECLARE @sql NVARCHAR(MAX);
-
-        DECLARE col_cur CURSOR LOCAL FAST_FORWARD FOR
-            SELECT ColumnName FROM #Cols;
-
-        OPEN col_cur;
-        FETCH NEXT FROM col_cur INTO @Col;
+    if discovery_rows > 0:
+        # First rows only: TOP stops reading at the first matches and nothing is counted
+        statement = """N'
+INSERT INTO #Samples (ColumnName, RowJson)
+SELECT TOP (@rows) @colName,
+     (SELECT t.* FOR JSON PATH, WITHOUT_ARRAY_WRAPPER)
+FROM ' + @FullTable + N' AS t
+WHERE ' + @Predicate + N'
+  AND ' + @RowFilter + N';
 
-        WHILE @@FETCH_STATUS = 0
-        BEGIN
-            SET @sql = N'
+DECLARE @found INT = @@ROWCOUNT;
+IF @found > 0
+    INSERT INTO #Hits (ColumnName, MatchCount) VALUES (@colName, @found);'"""
+    else:
+        statement = """N'
 IF EXISTS (
     SELECT 1
     FROM ' + @FullTable + N'
-            WHERE ' + QUOTENAME(@Col) + N' LIKE N''%'' + @p + N''%''
+            WHERE ' + @Predicate + N'
       AND ' + @RowFilter + N'
 )
 BEGIN
@@ -335,20 +572,45 @@ BEGIN
  SELECT @colName,
      COUNT(*)
  FROM ' + @FullTable + N'
- WHERE ' + QUOTENAME(@Col) + N' LIKE N''%'' + @p + N''%''
+ WHERE ' + @Predicate + N'
    AND ' + @RowFilter + N';
 
  INSERT INTO #Samples (ColumnName, RowJson)
  SELECT TOP (5) @colName,
      (SELECT t.* FOR JSON PATH, WITHOUT_ARRAY_WRAPPER)
  FROM ' + @FullTable + N' AS t
- WHERE ' + QUOTENAME(@Col) + N' LIKE N''%'' + @p + N''%''
+ WHERE ' + @Predicate + N'
  AND ' + @RowFilter + N';
-END';
+END'"""
+
+    stop_check = ''
+    if discovery_rows > 0 and max_hit_columns > 0:
+        stop_check = f"""
+            IF (SELECT COUNT(*) FROM #Hits) >= {max_hit_columns}
+                BREAK;
+"""
+
+    cursor_block = textwrap.dedent(f"""
+        DECLARE @Col SYSNAME;
+        DECLARE @Kind NVARCHAR(10);
+        DECLARE @Predicate NVARCHAR(MAX);
+        DECLARE @sql NVARCHAR(MAX);
+
+        DECLARE col_cur CURSOR LOCAL FAST_FORWARD FOR
+            SELECT ColumnName, ColumnKind FROM #Cols ORDER BY ColumnId;
 
-            EXEC sp_executesql @sql, N'@p NVARCHAR(200), @colName SYSNAME', @p = @SearchValue, @colName = @Col;
+        OPEN col_cur;
+        FETCH NEXT FROM col_cur INTO @Col, @Kind;
+
+        WHILE @@FETCH_STATUS = 0
+        BEGIN
+            SET @Predicate = {predicate_sql('@Col', '@Kind', mode)};
+            SET @sql = {statement};
 
-            FETCH NEXT FROM col_cur INTO @Col;
+            EXEC sp_executesql @sql, N'{SCAN_PARAMETERS}, @colName SYSNAME, @rows INT', {SCAN_ARGUMENTS},
+                 @colName = @Col, @rows = {max(discovery_rows, 0)};
+{stop_check}
+            FETCH NEXT FROM col_cur INTO @Col, @Kind;
         END
 
         CLOSE col_cur;
@@ -371,10 +633,300 @@ END';
             ColumnsScanned = (SELECT COUNT(*) FROM #Cols);
     """)
 
-    parts = [sql_body, column_scan, cursor_block, result_block]
+    scan_block = render_set_scan(mode) if strategy == 'set' else cursor_block
+    parts = [sql_body, render_search_declarations(mode), column_scan, scan_block, result_block]
     return '\n'.join(part.strip('\n') for part in parts) + '\n'
 
 
+def set_scan_statement(source: str, row_filter: str = '1 = 1') -> str:
+    """NVARCHAR literal of the single-pass statement filling #SetHits.
+
+    source and row_filter are spliced into the literal as-is, so they may
+    close it to concatenate T-SQL variables (e.g. "' + @FullTable + N' AS t").
+    The statement expects @ValuesList to hold the unpivot rows and takes
+    SCAN_PARAMETERS (match patterns and typed forms of the search value).
+
+    The derived table carries the row (t.*) next to its window values, which
+    are named SetScan.* so FOR JSON PATH nests them under one key that
+    JSON_MODIFY drops again; ROW_NUMBER is thus computed once per row.
+    """
+    return f"""N'
+INSERT INTO #SetHits (ColumnId, MatchCount, SampleNo, RowJson)
+SELECT h.[SetScan.ColumnId], h.[SetScan.MatchCount], h.[SetScan.SampleNo],
+       JSON_MODIFY((SELECT h.* FOR JSON PATH, WITHOUT_ARRAY_WRAPPER), ''$.SetScan'', NULL)
+FROM (
+    SELECT t.*,
+           v.SearchColumnId AS [SetScan.ColumnId],
+           COUNT(*) OVER (PARTITION BY v.SearchColumnId) AS [SetScan.MatchCount],
+           ROW_NUMBER() OVER (PARTITION BY v.SearchColumnId ORDER BY (SELECT NULL)) AS [SetScan.SampleNo]
+    FROM {source}
+    CROSS APPLY (VALUES' + @ValuesList + N'
+    ) AS v (SearchColumnId, SearchHit)
+    WHERE v.SearchHit = 1
+      AND {row_filter}
+) AS h
+WHERE h.[SetScan.SampleNo] <= {SAMPLES_PER_COLUMN};'"""
+
+
+def render_set_scan(mode: str = 'contains') -> str:
+    """Scan block that evaluates every #Cols column in a single pass over the table.
+
+    Each row is unpivoted into (column id, hit flag) pairs via CROSS APPLY
+    (VALUES ...); window COUNT and ROW_NUMBER per column give the match count
+    and the first samples, whose row JSON is only built for kept rows.
+    """
+    return textwrap.dedent(f"""
+        IF OBJECT_ID('tempdb..#SetHits') IS NOT NULL DROP TABLE #SetHits;
+        CREATE TABLE #SetHits (
+            ColumnId   INT           NOT NULL,
+            MatchCount INT           NOT NULL,
+            SampleNo   INT           NOT NULL,
+            RowJson    NVARCHAR(MAX) NULL
+        );
+
+        DECLARE @sql NVARCHAR(MAX);
+        DECLARE @ValuesList NVARCHAR(MAX) = STUFF((
+            SELECT N',
+        (' + CAST(ColumnId AS NVARCHAR(10)) + N', CASE WHEN ' + {predicate_sql('ColumnName', 'ColumnKind', mode, 't.')} + N' THEN 1 END)'
+            FROM   #Cols
+            ORDER BY ColumnId
+            FOR XML PATH(''), TYPE
+        ).value('.', 'NVARCHAR(MAX)'), 1, 1, N'');
+
+        IF @ValuesList IS NOT NULL
+        BEGIN
+            SET @sql = {set_scan_statement("' + @FullTable + N' AS t", "' + @RowFilter + N'")};
+
+            EXEC sp_executesql @sql, N'{SCAN_PARAMETERS}', {SCAN_ARGUMENTS};
+        END
+
+        INSERT INTO #Hits (ColumnName, MatchCount)
+        SELECT c.ColumnName, h.MatchCount
+        FROM   #SetHits AS h
+        JOIN   #Cols    AS c ON c.ColumnId = h.ColumnId
+        WHERE  h.SampleNo = 1;
+
+        INSERT INTO #Samples (ColumnName, RowJson)
+        SELECT c.ColumnName, h.RowJson
+        FROM   #SetHits AS h
+        JOIN   #Cols    AS c ON c.ColumnId = h.ColumnId
+        ORDER BY c.ColumnId, h.SampleNo;
+    """)
+
+
+def render_multi_table_sql(
+    database: str,
+    schema: Optional[str],
+    table_columns: Dict[Tuple[str, str], List[str]],
+    search_value: str,
+    excluded_columns: List[str],
+    row_cap: int,
+    mode: str = 'contains',
+) -> str:
+    """Build a script that searches every listed table of a database, smallest first.
+
+    table_columns maps (schema, table) to the candidate columns taken from the
+    index (see build_search_column_index); only those whose current type and
+    length can still match are scanned. Each
+    table is read once with the set-based scan, limited to its first row_cap
+    rows (0 = no limit), and RAISERROR ... WITH NOWAIT reports progress.
+    A table's hits are returned (one result set plus a NOWAIT message that
+    flushes it) as soon as its scan ends, so small tables answer first; the
+    combined results follow at the end.
+    mode is contains, prefix or exact (fulltext needs per-column queries).
+    """
+    if mode not in SEARCH_MODES or mode == 'fulltext':
+        raise ValueError(f'Unsupported search mode for multi-table search: {mode}')
+    db_ident = quote_identifier(database)
+    escaped_search = escape_sql_literal(search_value)
+    scope_comment = schema if schema else 'all schemas'
+    exclusion_comment = ', '.join(excluded_columns) if excluded_columns else 'none'
+    conditions = column_filter_sql(search_value)
+    if excluded_columns:
+        conditions.append(f"c.name NOT IN ({sql_name_list(excluded_columns)})")
+    filter_clause = ''.join(f"\n          AND  {condition}" for condition in conditions)
+
+    catalog_rows = [
+        f"(N'{escape_sql_literal(table_schema)}', N'{escape_sql_literal(table)}', N'{escape_sql_literal(column)}')"
+        for (table_schema, table), columns in sorted(table_columns.items())
+        for column in columns
+    ]
+    catalog_inserts = '\n'.join(
+        'INSERT INTO #CatalogCols (SchemaName, TableName, ColumnName) VALUES\n    '
+        + ',\n    '.join(catalog_rows[start:start + MAX_VALUES_ROWS]) + ';'
+        for start in range(0, len(catalog_rows), MAX_VALUES_ROWS)
+    )
+
+    sql_body = textwrap.dedent(f"""
+        /*
+        Auto-generated by 1-python/find_col_from_val.py (multi-table search)
+        Seed template: 2-sql/find-ColumnName-containing-target-value.sql
+        Target database: {db_ident}
+        Target schema: {scope_comment}
+        Tables from index: {len(table_columns)}
+        Search value: {search_value}
+        Excluded columns: {exclusion_comment}
+        Searched types: {', '.join(searchable_types(search_value))}
+        Search mode: {mode}
+        Rows scanned per table: {row_cap if row_cap > 0 else 'all'} (MatchCount covers scanned rows only)
+        */
+        SET NOCOUNT ON;
+
+        DECLARE @SearchValue NVARCHAR(200) = N'{escaped_search}';
+        DECLARE @RowCap BIGINT = {max(row_cap, 0)};
+
+        IF OBJECT_ID('tempdb..#CatalogCols') IS NOT NULL DROP TABLE #CatalogCols;
+        CREATE TABLE #CatalogCols (
+            SchemaName SYSNAME NOT NULL,
+            TableName  SYSNAME NOT NULL,
+            ColumnName SYSNAME NOT NULL
+        );
+    """)
+
+    setup_block = textwrap.dedent(f"""
+        IF OBJECT_ID('tempdb..#Tables') IS NOT NULL DROP TABLE #Tables;
+        CREATE TABLE #Tables (
+            TableId       INT IDENTITY(1, 1) NOT NULL,
+            ObjectId      INT                NOT NULL,
+            SchemaName    SYSNAME            NOT NULL,
+            TableName     SYSNAME            NOT NULL,
+            FullTable     NVARCHAR(776)      NOT NULL,
+            EstimatedRows BIGINT             NOT NULL
+        );
+
+        IF OBJECT_ID('tempdb..#Cols') IS NOT NULL DROP TABLE #Cols;
+        CREATE TABLE #Cols (
+            ColumnId   INT IDENTITY(1, 1) NOT NULL,
+            TableId    INT                NOT NULL,
+            ColumnName SYSNAME            NOT NULL,
+            ColumnKind NVARCHAR(10)       NOT NULL
+        );
+
+        IF OBJECT_ID('tempdb..#SetHits') IS NOT NULL DROP TABLE #SetHits;
+        CREATE TABLE #SetHits (
+            ColumnId   INT           NOT NULL,
+            MatchCount INT           NOT NULL,
+            SampleNo   INT           NOT NULL,
+            RowJson    NVARCHAR(MAX) NULL
+        );
+
+        -- Tables from the index that still exist, smallest first (TableId follows the ORDER BY)
+        INSERT INTO #Tables (ObjectId, SchemaName, TableName, FullTable, EstimatedRows)
+        SELECT t.object_id, s.name, t.name,
+               N'{escape_sql_literal(db_ident)}.' + QUOTENAME(s.name) + N'.' + QUOTENAME(t.name),
+               ISNULL((SELECT SUM(p.rows)
+                       FROM   {db_ident}.sys.partitions AS p
+                       WHERE  p.object_id = t.object_id
+                         AND  p.index_id IN (0, 1)), 0) AS EstimatedRows
+        FROM   {db_ident}.sys.tables  AS t
+        JOIN   {db_ident}.sys.schemas AS s ON s.schema_id = t.schema_id
+        WHERE  EXISTS (SELECT 1 FROM #CatalogCols AS cc
+                       WHERE cc.SchemaName = s.name COLLATE DATABASE_DEFAULT
+                         AND cc.TableName  = t.name COLLATE DATABASE_DEFAULT)
+        ORDER BY EstimatedRows, s.name, t.name;
+
+        -- Indexed columns whose current type and length can still match
+        INSERT INTO #Cols (TableId, ColumnName, ColumnKind)
+        SELECT tb.TableId, c.name, {column_kind_sql(db_ident, mode)}
+        FROM   #Tables AS tb
+        JOIN   {db_ident}.sys.columns AS c  ON c.object_id = tb.ObjectId
+        JOIN   {db_ident}.sys.types   AS ty ON ty.user_type_id = c.user_type_id
+        WHERE  EXISTS (SELECT 1 FROM #CatalogCols AS cc
+                       WHERE cc.SchemaName = tb.SchemaName
+                         AND cc.TableName  = tb.TableName
+                         AND cc.ColumnName = c.name COLLATE DATABASE_DEFAULT){filter_clause}
+        ORDER BY tb.TableId, c.column_id;
+    """)
+
+    scan_block = textwrap.dedent(f"""
+        DECLARE @TableCount INT = (SELECT COUNT(*) FROM #Tables);
+        DECLARE @TableId INT = 1;
+        DECLARE @FullTable NVARCHAR(776);
+        DECLARE @EstimatedRows NVARCHAR(20);
+        DECLARE @Source NVARCHAR(MAX);
+        DECLARE @ValuesList NVARCHAR(MAX);
+        DECLARE @sql NVARCHAR(MAX);
+        DECLARE @Hits NVARCHAR(2000);  -- RAISERROR arguments cannot be NVARCHAR(MAX)
+
+        WHILE @TableId <= @TableCount
+        BEGIN
+            SELECT @FullTable = FullTable, @EstimatedRows = CAST(EstimatedRows AS NVARCHAR(20))
+            FROM   #Tables
+            WHERE  TableId = @TableId;
+
+            RAISERROR(N'[%d/%d] %s (~%s rows)', 0, 1, @TableId, @TableCount, @FullTable, @EstimatedRows) WITH NOWAIT;
+
+            SET @ValuesList = STUFF((
+                SELECT N',
+        (' + CAST(ColumnId AS NVARCHAR(10)) + N', CASE WHEN ' + {predicate_sql('ColumnName', 'ColumnKind', mode, 't.')} + N' THEN 1 END)'
+                FROM   #Cols
+                WHERE  TableId = @TableId
+                ORDER BY ColumnId
+                FOR XML PATH(''), TYPE
+            ).value('.', 'NVARCHAR(MAX)'), 1, 1, N'');
+
+            IF @ValuesList IS NOT NULL
+            BEGIN
+                SET @Source = CASE WHEN @RowCap > 0
+                                   THEN N'(SELECT TOP (@cap) * FROM ' + @FullTable + N') AS t'
+                                   ELSE @FullTable + N' AS t' END;
+                SET @sql = {set_scan_statement("' + @Source + N'")};
+
+                EXEC sp_executesql @sql, N'{SCAN_PARAMETERS}, @cap BIGINT', {SCAN_ARGUMENTS}, @cap = @RowCap;
+
+                -- Hand this table's hits to the client now instead of after the last table
+                SET @Hits = LEFT(STUFF((
+                    SELECT N', ' + c.ColumnName + N' (' + CAST(h.MatchCount AS NVARCHAR(20)) + N')'
+                    FROM   #SetHits AS h
+                    JOIN   #Cols    AS c ON c.ColumnId = h.ColumnId
+                    WHERE  c.TableId = @TableId
+                      AND  h.SampleNo = 1
+                    ORDER BY c.ColumnId
+                    FOR XML PATH(''), TYPE
+                ).value('.', 'NVARCHAR(MAX)'), 1, 2, N''), 1900);
+
+                IF @Hits IS NOT NULL
+                BEGIN
+                    SELECT tb.SchemaName, tb.TableName, c.ColumnName, h.MatchCount, h.SampleNo, h.RowJson
+                    FROM   #SetHits AS h
+                    JOIN   #Cols    AS c  ON c.ColumnId = h.ColumnId
+                    JOIN   #Tables  AS tb ON tb.TableId = c.TableId
+                    WHERE  c.TableId = @TableId
+                    ORDER BY c.ColumnId, h.SampleNo;
+
+                    RAISERROR(N'    hits in %s: %s', 0, 1, @FullTable, @Hits) WITH NOWAIT;
+                END
+            END
+
+            SET @TableId += 1;
+        END
+    """)
+
+    result_block = textwrap.dedent("""
+        SELECT tb.SchemaName, tb.TableName, c.ColumnName, h.MatchCount, tb.EstimatedRows
+        FROM   #SetHits AS h
+        JOIN   #Cols    AS c  ON c.ColumnId = h.ColumnId
+        JOIN   #Tables  AS tb ON tb.TableId = c.TableId
+        WHERE  h.SampleNo = 1
+        ORDER BY tb.TableId, c.ColumnId;
+
+        SELECT tb.SchemaName, tb.TableName, c.ColumnName, h.SampleNo, h.RowJson
+        FROM   #SetHits AS h
+        JOIN   #Cols    AS c  ON c.ColumnId = h.ColumnId
+        JOIN   #Tables  AS tb ON tb.TableId = c.TableId
+        ORDER BY tb.TableId, c.ColumnId, h.SampleNo;
+
+        SELECT
+            SearchValue    = @SearchValue,
+            RowCap         = @RowCap,
+            TablesScanned  = @TableCount,
+            ColumnsScanned = (SELECT COUNT(*) FROM #Cols);
+    """)
+
+    parts = [sql_body, render_search_declarations(mode), catalog_inserts, setup_block, scan_block, result_block]
+    return '\n\n'.join(part.strip('\n') for part in parts if part) + '\n'
+
+
 def choose_output_path(database: str, schema: str, table: str) -> Optional[str]:
     """Ask the user whether to save the SQL script and determine the destination path."""
     default_name = (
@@ -417,6 +969,10 @@ def summarize_inputs(
     search_value: str,
     row_filter: str,
     excluded_columns: List[str],
+    strategy: str,
+    mode: str,
+    discovery_rows: int = 0,
+    max_hit_columns: int = 0,
 ) -> None:
     """Display a concise summary before generating SQL."""
     print('\nConfiguration summary:')
@@ -427,30 +983,168 @@ def summarize_inputs(
         print(f"  Exclusions   : {', '.join(excluded_columns)}")
     else:
         print('  Exclusions   : none')
+    print(f'  Search mode  : {mode}')
+    print(f'  Strategy     : {strategy}')
+    if discovery_rows > 0:
+        stop = f'stop after {max_hit_columns} columns' if max_hit_columns > 0 else 'all columns'
+        print(f'  Discovery    : first {discovery_rows} rows per column, {stop}')
+    else:
+        print('  Discovery    : off')
 
 
-def load_seed_preview() -> None:
-    """Print the seed template path for user awareness."""
-    exists = os.path.exists(SEED_SQL_PATH)
-    print(f"Seed template: {SEED_SQL_PATH} ({'found' if exists else 'missing'})")
+def prompt_strategy(default: str = 'set') -> str:
+    """Ask how the generated script should scan the table."""
+    print("\nScan strategy: 'set' reads the table once for all columns, "
+          "'cursor' runs separate (index-seekable) queries per column.")
+    while True:
+        choice = input(f'Strategy [{default}]: ').strip().lower()
+        if not choice:
+            return default
+        if choice in SCAN_STRATEGIES:
+            return choice
+        print(f"Enter one of: {', '.join(SCAN_STRATEGIES)}.")
 
 
-def main() -> None:
-    load_seed_preview()
+def prompt_search_mode(search_value: str, modes: Tuple[str, ...] = SEARCH_MODES) -> Tuple[str, str]:
+    """Ask for the search mode; 'auto' (default) infers it from the value (see infer_search_mode).
+
+    Returns (mode, search value without wildcard markers).
+    """
+    while True:
+        choice = input(f"Search mode - {', '.join(modes)} or auto [auto]: ").strip().lower()
+        if not choice or choice == 'auto':
+            return infer_search_mode(search_value)
+        if choice in modes:
+            return choice, search_value
+        print(f"Enter one of: {', '.join(modes)}, auto.")
+
 
-    entries = read_index(INDEX_PATH)
-    table_index = build_table_index(entries)
-    table_choices = sorted(table_index.keys(), key=format_table)
+def prompt_discovery() -> Tuple[int, int]:
+    """Ask for discovery mode settings; returns (rows per column, max matching columns), (0, 0) = off."""
+    while True:
+        raw = input(f'Discovery mode - rows per column (default 0 = off, e.g. {DEFAULT_DISCOVERY_ROWS}): ').strip()
+        if not raw:
+            return 0, 0
+        if raw.isdigit():
+            break
+        print('Enter a non-negative whole number.')
+    discovery_rows = int(raw)
+    if not discovery_rows:
+        return 0, 0
+    while True:
+        raw = input('Stop after this many matching columns (default 0 = all): ').strip()
+        if not raw:
+            return discovery_rows, 0
+        if raw.isdigit():
+            return discovery_rows, int(raw)
+        print('Enter a non-negative whole number.')
+
+
+def prompt_scope() -> str:
+    """Ask whether to search one table, one schema or a whole database (default: table)."""
+    while True:
+        choice = input("\nSearch scope - 'table', 'schema' or 'database' [table]: ").strip().lower()
+        if not choice:
+            return 'table'
+        if choice in SEARCH_SCOPES:
+            return choice
+        print(f"Enter one of: {', '.join(SEARCH_SCOPES)}.")
+
+
+def prompt_name_choice(label: str, names: List[str]) -> str:
+    """Pick a name from a numbered list, or type any name directly."""
+    print(f'\nAvailable {label}s:')
+    for idx, name in enumerate(names, 1):
+        print(f'  {idx:2d}. {name}')
+    while True:
+        choice = input(f'{label.capitalize()} (number or name): ').strip()
+        if choice.isdigit() and 1 <= int(choice) <= len(names):
+            return names[int(choice) - 1]
+        if choice and not choice.isdigit():
+            return choice
+        print(f'Enter a number between 1 and {len(names)} or a {label} name.')
+
+
+def prompt_row_cap() -> int:
+    """Ask for the maximum number of rows scanned per table (0 = no cap)."""
+    while True:
+        raw = input(f'Max rows scanned per table (default {DEFAULT_ROW_CAP}, 0 = all): ').strip()
+        if not raw:
+            return DEFAULT_ROW_CAP
+        if raw.isdigit():
+            return int(raw)
+        print('Enter a non-negative whole number.')
+
+
+def run_multi_table(catalog: ColumnCatalog, scope: str) -> Tuple[str, str, str, str]:
+    """Collect inputs for a schema / database wide search and return (database, schema, table, sql)."""
+    table_index = build_table_index(catalog.entries())
+    databases = sorted({source for source, _, _ in table_index}, key=str.lower)
+    database = prompt_name_choice('database', databases)
+
+    schema = None
+    if scope == 'schema':
+        schemas = sorted({key[1] for key in table_index if key[0].lower() == database.lower()}, key=str.lower)
+        schema = prompt_name_choice('schema', schemas)
 
-    database, schema, table = prompt_table_choice(table_choices)
     search_value = prompt_non_empty('\nSearch value (literal fragment to look for): ')
-    row_filter = prompt_optional("Row filter (T-SQL predicate, default 1 = 1): ")
+    mode, search_value = prompt_search_mode(search_value, ('contains', 'prefix', 'exact'))
+    table_columns = build_search_column_index(catalog, database, schema, search_value)
+    if not table_columns:
+        print(f'No indexed columns of {database}{"." + schema if schema else ""} can contain "{search_value}".')
+        sys.exit(1)
+    print(f'{len(table_columns)} tables with searchable columns found in the index.')
+
     exclusions_raw = prompt_optional('Columns to exclude (comma-separated, optional): ')
     excluded_columns = parse_exclusions(exclusions_raw)
+    row_cap = prompt_row_cap()
+
+    sql_text = render_multi_table_sql(database, schema, table_columns, search_value, excluded_columns, row_cap, mode)
+    return database, schema or 'all', 'all-tables', sql_text
+
+
+def load_seed_preview() -> None:
+    """Print the seed template path for user awareness."""
+    exists = os.path.exists(SEED_SQL_PATH)
+    print(f"Seed template: {SEED_SQL_PATH} ({'found' if exists else 'missing'})")
 
-    summarize_inputs(database, schema, table, search_value, row_filter, excluded_columns)
 
-    sql_text = render_sql(database, schema, table, search_value, row_filter, excluded_columns)
+def main() -> None:
+    load_seed_preview()
+
+    catalog = read_index(INDEX_PATH)
+    scope = prompt_scope()
+
+    if scope == 'table':
+        table_index = build_table_index(catalog.entries())
+        table_choices = sorted(table_index.keys(), key=format_table)
+
+        database, schema, table = prompt_table_choice(table_choices)
+        search_value = prompt_non_empty('\nSearch value (literal fragment to look for): ')
+        mode, search_value = prompt_search_mode(search_value)
+        row_filter = prompt_optional("Row filter (T-SQL predicate, default 1 = 1): ")
+        exclusions_raw = prompt_optional('Columns to exclude (comma-separated, optional): ')
+        excluded_columns = parse_exclusions(exclusions_raw)
+        discovery_rows, max_hit_columns = prompt_discovery()
+        if mode == 'fulltext' or discovery_rows:
+            strategy = 'cursor'
+        else:
+            strategy = prompt_strategy('cursor' if mode in SARGABLE_MODES else 'set')
+        pruned_columns = prune_table_columns(catalog, database, schema, table, search_value)
+
+        summarize_inputs(
+            database, schema, table, search_value, row_filter, excluded_columns, strategy, mode,
+            discovery_rows, max_hit_columns
+        )
+        if pruned_columns:
+            print(f"  Pruned       : {', '.join(pruned_columns)} (shorter than the search value)")
+
+        sql_text = render_sql(
+            database, schema, table, search_value, row_filter, excluded_columns, strategy, pruned_columns, mode,
+            discovery_rows, max_hit_columns
+        )
+    else:
+        database, schema, table, sql_text = run_multi_table(catalog, scope)
 
     print('\nGenerated SQL script:\n')
     print(sql_text)
@@ -2,14 +2,28 @@
 """Find shortest join path between two columns using columns.csv file and schema XML.
 
 Usage: run the script and follow prompts.
+       join_cols.py --build-paths [DATABASE ...] precomputes all-pairs join paths
+       (next hops per connected component) for instant lookups; a database's
+       paths file is rebuilt only when its schema XML has changed. It serves
+       fewest-joins lookups between two targets; table stats, --targets and
+       --alternatives search the graph directly.
 
 Behavior implemented per user request:
 - prompts user to choose among available database data folders (e.g. DWH_Dyconex) inside `0-data`
 - uses columns.csv inside chosen folder as list of all available schemas, tables, columns
 - prompts user to choose iteratively between 1st and 2nd target-path
 - a target-path is a unique concatenation of schema-table-column
-- finds shortest path of table joins (BFS) between tables containing the two target paths
+- finds shortest path of table joins (bidirectional BFS over a cached join graph) between tables containing the two target paths
 - prints an SQL inner-join statement joining tables along the found path
+- with --targets N (N > 2) prompts for N target paths and joins their tables
+  through one near-minimal join tree (Steiner tree heuristic) instead of a path
+- if the database folder has a table-stats.csv (TableName, RowCount and optional
+  IndexedColumns), paths and trees minimize the estimated rows read instead of
+  the number of joins: joining on an indexed or primary key column costs a
+  seek, any other join column a scan of the table (--ignore-stats to disable)
+- with --alternatives K lists up to K loopless join paths, best first, and lets
+  the user pick the one to turn into SQL (e.g. when the shortest route joins
+  through a semantically wrong table)
 
 Assumptions:
 - columns.csv has format: TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_TYPE, CHARACTER_MAXIMUM_LENGTH, IS_NULLABLE
@@ -17,12 +31,20 @@ Assumptions:
 - table names in XML match those in columns.csv
 """
 
+import argparse
 import os
 import sys
-import csv
-import xml.etree.ElementTree as ET
-from collections import defaultdict, deque
-from typing import Dict, List, Tuple, Set  
+import time
+from array import array
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple, Set  
+
+from column_catalog import load_columns_csv
+from join_graph import (
+    RelationGraph, TreeStep, build_path_file, load_path_table, load_relation_graph, read_table_stats
+)
+
+TABLE_STATS_FILE = 'table-stats.csv'
 
 
 def find_csv_databases(base_dir: str) -> List[Tuple[str, str]]:
@@ -43,19 +65,6 @@ def find_csv_databases(base_dir: str) -> List[Tuple[str, str]]:
 
     return sorted(databases, key=lambda entry: entry[0].lower())
 
-def _detect_delimiter(first_line: str) -> str:
-    """Heuristically detect delimiter between tab and comma."""
-    comma_count = first_line.count(',')
-    tab_count = first_line.count('\t')
-    if tab_count and not comma_count:
-        return '\t'
-    if comma_count and not tab_count:
-        return ','
-    if tab_count >= comma_count:
-        return '\t'
-    return ','
-
-
 def read_columns_csv(path: str) -> Tuple[Dict[str, List[str]], Dict[str, Set[str]], List[str]]:
     """Parse the columns.csv file.
 
@@ -70,45 +79,8 @@ def read_columns_csv(path: str) -> Tuple[Dict[str, List[str]], Dict[str, Set[str
     column_to_tables: Dict[str, Set[str]] = defaultdict(set)
     table_to_columns: Dict[str, List[str]] = defaultdict(list)
 
-    if not os.path.exists(path):
-        return [], column_to_tables, table_to_columns
-
-    with open(path, encoding='utf-8', errors='replace', newline='') as f:
-        first_line = f.readline()
-        if not first_line:
-            return [], column_to_tables, table_to_columns
-
-        delimiter = _detect_delimiter(first_line)
-        f.seek(0)
-
-        reader = csv.reader(f, delimiter=delimiter, skipinitialspace=True)
-        try:
-            header_row = next(reader)
-        except StopIteration:
-            return [], column_to_tables, table_to_columns
-
-        header_clean = [cell.strip().upper() for cell in header_row]
-        has_header = {'TABLE_SCHEMA', 'TABLE_NAME', 'COLUMN_NAME'}.issubset(set(header_clean))
-
-        rows_to_process: List[List[str]] = []
-        if not has_header:
-            rows_to_process.append(header_row)
-
-        for row_values in reader:
-            rows_to_process.append(row_values)
-
-    for raw_row in rows_to_process:
-        row = [cell.strip() for cell in raw_row]
-        if len(row) < 3:
-            continue
-
-        schema = row[0]
-        table = row[1]
-        column = row[2]
-
-        if not schema or not table or not column:
-            continue
-
+    catalog = load_columns_csv(path, source='')
+    for _, schema, table, column in catalog.entries():
         target_path = f"{schema}-{table}-{column}"
         target_paths.append(target_path)
 
@@ -225,77 +197,6 @@ def path_to_table_column(target_path: str) -> Tuple[str, str]:
         return table, column
     return "", ""
 
-def parse_schema_xml(path: str) -> Tuple[Dict[str, List[Tuple[str,str]]], Set[str]]:
-    """Parse the WWW SQL Designer XML and extract relations.
-
-    Returns:
-      relations: Dict[src_table, List[(dst_table, (src_col, dst_col))]]
-      tables: set of table names present in XML
-
-    We parse <table name="..."> with child <row name="..."> and inner <relation table="..." row="..." /> elements.
-    For each relation element inside a row of a table, we create an undirected edge between the current table and the referenced table with join columns (current row name, relation row).
-    """
-    tree = ET.parse(path)
-    root = tree.getroot()
-    relations: Dict[str, List[Tuple[str, Tuple[str,str]]]] = defaultdict(list)
-    tables: Set[str] = set()
-
-    for table in root.findall('.//table'):
-        tname = table.get('name')
-        if not tname:
-            continue
-        tables.add(tname)
-        for row in table.findall('row'):
-            src_col = row.get('name')
-            if not src_col:
-                continue
-            for rel in row.findall('relation'):
-                dst_table = rel.get('table')
-                dst_col = rel.get('row')
-                if dst_table and dst_col:
-                    # add bidirectional edge
-                    relations[tname].append((dst_table, (src_col, dst_col)))
-                    relations[dst_table].append((tname, (dst_col, src_col)))
-                    tables.add(dst_table)
-    return relations, tables
-
-
-def bfs_shortest_path(relations: Dict[str, List[Tuple[str, Tuple[str,str]]]], start: str, targets: Set[str]) -> List[Tuple[str, Tuple[str,str]]]:
-    """BFS over tables to find shortest path from start table to any target table.
-
-    Returns a list of (table_name, join_info) entries representing the path. join_info is the join columns used between previous table and this table.
-    The first element is (start, None).
-    """
-    q = deque()
-    q.append(start)
-    parent = {start: None}
-    parent_join = {start: None}
-
-    found = None
-    while q:
-        cur = q.popleft()
-        if cur in targets:
-            found = cur
-            break
-        for (nbr, (cur_col, nbr_col)) in relations.get(cur, []):
-            if nbr not in parent:
-                parent[nbr] = cur
-                parent_join[nbr] = (cur_col, nbr_col)
-                q.append(nbr)
-
-    if not found:
-        return []
-
-    # reconstruct path
-    path = []
-    cur = found
-    while cur is not None:
-        path.append((cur, parent_join[cur]))
-        cur = parent[cur]
-    path.reverse()
-    return path
-
-
 def build_sql_from_path(path: List[Tuple[str, Tuple[str,str]]], database_name: str, table_to_schema: Dict[str, str]) -> str:
     """Construct an INNER JOIN SQL joining all tables along path.
 
@@ -323,7 +224,119 @@ def build_sql_from_path(path: List[Tuple[str, Tuple[str,str]]], database_name: s
     return '\n'.join(sql) + ';'
 
 
+def build_sql_from_tree(tree: List[TreeStep], database_name: str, table_to_schema: Dict[str, str]) -> str:
+    """Construct one INNER JOIN SQL statement joining all tables of a join tree.
+
+    Tree is list of (table_name, join_info) where join_info for first item is None, for subsequent items is
+    (parent_table, parent_col, this_col) with the parent listed earlier. Tables are aliased t0, t1, ... in tree order.
+    """
+    if not tree:
+        return '-- no join tree found'
+    aliases = {table: f't{i}' for i, (table, _) in enumerate(tree)}
+    first_table = tree[0][0]
+    first_table_full = table_to_schema.get(first_table, first_table)
+    sql = [f'USE {database_name};', '', f'SELECT *\nFROM {first_table_full} AS {aliases[first_table]}']
+    for table, (parent_table, parent_col, this_col) in tree[1:]:
+        this_table_full = table_to_schema.get(table, table)
+        sql.append(f'INNER JOIN {this_table_full} AS {aliases[table]} '
+                   f'ON {aliases[parent_table]}."{parent_col}" = {aliases[table]}."{this_col}"')
+    return '\n'.join(sql) + ';'
+
+
+def plan_join_tree(target_paths: List[str], database_name: str, graph: RelationGraph,
+                   table_to_schema: Dict[str, str], count: int, costs: Optional[array] = None) -> None:
+    """Prompt for count target paths and print one SQL statement joining all their tables."""
+    tables_in_schema = set(graph.tables)
+    terminals: List[str] = []
+    for i in range(1, count + 1):
+        target_path = select_target_path(target_paths, f"Choose target path {i} of {count}:", database_name, tables_in_schema)
+        table, column = path_to_table_column(target_path)
+        if table not in tables_in_schema:
+            print(f'Table "{table}" not found in schema XML.')
+            print(f'Please choose columns from tables that have relationships defined.')
+            sys.exit(3)
+        print(f'Target {i}: {table}.{column}')
+        terminals.append(table)
+
+    print(f'\nFinding join tree for {len(set(terminals))} tables...')
+    tree = graph.steiner_tree(terminals, costs)
+    if not tree:
+        print('No join tree found: the target tables are not all connected')
+        sys.exit(0)
+
+    print(f'\nFound join tree ({len(tree) - 1} joins):')
+    for table, join in tree:
+        if join:
+            print(f'  {table} (via {join[0]}.{join[1]} = {join[2]})')
+        else:
+            print(f'  {table} (root)')
+
+    sql = build_sql_from_tree(tree, database_name, table_to_schema)
+    print('\nGenerated SQL:')
+    print(sql)
+
+
+def choose_alternative(alternatives: List[Tuple[float, List[Tuple[str, Tuple[str, str]]]]],
+                       costs: Optional[array]) -> Tuple[Optional[float], List[Tuple[str, Tuple[str, str]]]]:
+    """List ranked alternative join paths and let the user pick one; returns (estimated cost or None, path)."""
+    if not alternatives:
+        return None, []
+
+    print(f'\n{len(alternatives)} alternative join paths:')
+    for idx, (cost, path) in enumerate(alternatives, 1):
+        ranking = f'{len(path) - 1} joins' + (f', est. {cost:,.0f} rows' if costs is not None else '')
+        print(f'  {idx:2d}. {ranking}: ' + ' -> '.join(table for table, _ in path))
+
+    while True:
+        choice = input(f'\nChoose path (1-{len(alternatives)}, default 1): ').strip()
+        if not choice:
+            choice = '1'
+        if choice.isdigit() and 1 <= int(choice) <= len(alternatives):
+            cost, path = alternatives[int(choice) - 1]
+            return (cost if costs is not None else None), path
+        print('Invalid choice')
+
+
+def build_paths(databases: List[Tuple[str, str]], names: List[str]) -> None:
+    """Precompute the join paths file of every selected database whose schema XML changed."""
+    wanted = {name.lower() for name in names}
+    for name in sorted(wanted - {db_name.lower() for db_name, _ in databases}):
+        print(f'{name}: no such database folder in 0-data/')
+    for db_name, db_path in databases:
+        if wanted and db_name.lower() not in wanted:
+            continue
+        schema_path = os.path.join(db_path, f'{db_name}-schema.xml')
+        if not os.path.exists(schema_path):
+            print(f'{db_name}: schema XML not found, skipped')
+            continue
+        graph = load_relation_graph(schema_path)
+        path_table = load_path_table(schema_path, graph)
+        if path_table is not None:
+            path_table.close()
+            print(f'{db_name}: join paths up to date')
+            continue
+        started = time.perf_counter()
+        paths_file = build_path_file(schema_path, graph)
+        print(f'{db_name}: {len(graph)} tables, {os.path.getsize(paths_file):,} bytes written to {paths_file} '
+              f'in {time.perf_counter() - started:.1f}s')
+
+
 def main():
+    parser = argparse.ArgumentParser(description='Find the shortest join path between two columns.')
+    parser.add_argument('--build-paths', nargs='*', metavar='DATABASE',
+                        help='precompute all-pairs join paths for the given databases (default: all) and exit')
+    parser.add_argument('--targets', type=int, default=2, metavar='N',
+                        help='number of target columns to join (default 2); more than 2 plans one join tree')
+    parser.add_argument('--alternatives', type=int, default=1, metavar='K',
+                        help='list up to K alternative join paths between two targets and choose one (default 1)')
+    parser.add_argument('--ignore-stats', action='store_true',
+                        help=f'minimize the number of joins even if {TABLE_STATS_FILE} exists')
+    args = parser.parse_args()
+    if args.targets < 2:
+        parser.error('--targets must be at least 2')
+    if args.alternatives < 1:
+        parser.error('--alternatives must be at least 1')
+
     base = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
     
     # Find available database folders
@@ -332,6 +345,10 @@ def main():
         print('No database folders found in 0-data/')
         sys.exit(1)
 
+    if args.build_paths is not None:
+        build_paths(databases, args.build_paths)
+        return
+
     print('\nAvailable databases:')
     for idx, (db_name, _) in enumerate(databases, 1):
         print(f'{idx}. {db_name}')
@@ -366,9 +383,21 @@ def main():
     # Create table to schema mapping
     table_to_schema = create_table_to_schema_mapping(target_paths)
 
-    print('Parsing schema XML...')
-    relations, tables_in_schema = parse_schema_xml(schema_path)
-    print(f'Parsed {len(tables_in_schema)} tables and {sum(len(v) for v in relations.values())} relation entries.')
+    print('Loading join graph...')
+    graph = load_relation_graph(schema_path)
+    tables_in_schema = set(graph.tables)
+    print(f'Loaded {len(graph)} tables and {graph.edge_count} relation entries.')
+
+    costs = None
+    stats_path = os.path.join(selected_db_path, TABLE_STATS_FILE)
+    if not args.ignore_stats and os.path.exists(stats_path):
+        stats = read_table_stats(stats_path)
+        costs = graph.edge_costs(stats)
+        print(f'Using row counts of {len(stats)} tables from {TABLE_STATS_FILE} for cost-based joins.')
+
+    if args.targets > 2:
+        plan_join_tree(target_paths, selected_db_name, graph, table_to_schema, args.targets, costs)
+        return
 
     # Prompt for two target paths
     target_path1 = select_target_path(target_paths, "Choose first target path:", selected_db_name, tables_in_schema)
@@ -399,7 +428,20 @@ def main():
     targets = {table2}
     print(f'Finding path from {table1} to {table2}...')
 
-    path = bfs_shortest_path(relations, table1, targets)
+    cost = None
+    if args.alternatives > 1:
+        cost, path = choose_alternative(graph.k_shortest_paths(table1, table2, args.alternatives, costs), costs)
+    elif costs is not None:
+        cost, path = graph.cheapest_path(table1, targets, costs)
+    else:
+        # The next-hop table holds fewest-joins paths only, so it is consulted on this branch alone
+        path_table = load_path_table(schema_path, graph)
+        if path_table is not None:
+            print('Using precomputed join paths.')
+            path = path_table.shortest_path(graph, table1, targets)
+            path_table.close()
+        else:
+            path = graph.shortest_path(table1, targets)
     if not path:
         print('No join path found between the two tables')
         sys.exit(0)
@@ -410,6 +452,8 @@ def main():
             print(f'  {t} (via {join[0]} = {join[1]})')
         else:
             print(f'  {t} (start)')
+    if cost is not None:
+        print(f'Estimated join cost: {cost:,.0f} rows')
 
     sql = build_sql_from_path(path, selected_db_name, table_to_schema)
     print('\nGenerated SQL:')
@@ -0,0 +1,782 @@
+"""Join graph over the relations of a WWW SQL Designer schema XML.
+
+``RelationGraph`` stores the undirected table graph in CSR layout: tables are
+numbered by sorted name, ``offsets[t]:offsets[t + 1]`` is the slice of the
+edge arrays holding the neighbours of table ``t`` and, per edge slot, the
+join columns on both sides (as ids into ``columns``). Edges keep the order in
+which the XML declares them.
+
+Path queries run a bidirectional breadth-first search that always expands the
+smaller frontier, so a query only visits the tables near the two ends of the
+path instead of everything reachable from the start. ``steiner_tree`` builds
+on it to connect three or more tables with as few joins as it can find.
+
+With table statistics (``read_table_stats``) every edge gets the estimated
+cost of joining its target table: a seek when the join column is indexed
+(leading column of a key in the XML, or listed in the stats file), a full scan of
+the table's rows otherwise. ``cheapest_path`` and ``steiner_tree`` then run
+Dijkstra over these costs instead of counting joins.
+
+The graph is cached next to the schema XML (``<db>-schema.xml.graph.cache``)
+with ``column_catalog.load_cached`` and rebuilt whenever the XML changes.
+
+For repeated lookups ``build_path_file`` precomputes, per connected component,
+the next hop from every table towards every other table and writes the
+matrices to ``<db>-schema.xml.paths``. ``NextHopTable`` memory-maps that file
+and answers a path query by following next hops, in O(path length) without
+any search. The file records the size, modification time and SHA-1 of the XML
+it was built from; ``load_path_table`` ignores it once the XML has changed.
+
+Paths file layout (native byte order): the ``PATHS_HEADER`` struct, then
+``uint64`` matrix offsets per component (plus one end offset), ``uint32``
+component id and ``uint32`` index within the component per table, and
+finally the row-major next-hop matrices. A next hop is the position of the
+edge within the table's adjacency slice, stored as ``uint16`` (``uint32`` for
+tables with 65535 or more relations); the maximum value marks the diagonal.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import mmap
+import os
+import struct
+import xml.etree.ElementTree as ET
+from array import array
+from collections import defaultdict
+from math import isqrt
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from column_catalog import file_digest, iter_csv_rows, load_cached
+
+# (table name, (column of the previous table, column of this table)); None for the first table
+PathStep = Tuple[str, Optional[Tuple[str, str]]]
+# (table name, (parent table, parent's column, this table's column)); None for the root table
+TreeStep = Tuple[str, Optional[Tuple[str, str, str]]]
+
+# Key types of the schema XML whose columns can be seeked
+INDEXED_KEY_TYPES = ('PRIMARY', 'UNIQUE', 'INDEX')
+# Row count assumed for tables missing from the stats file
+DEFAULT_ROW_COUNT = 1000
+
+PATHS_MAGIC = b'JOINHOPS'
+PATHS_VERSION = 1
+# magic, version, hop item size, table count, component count, XML size, XML mtime_ns, XML SHA-1
+PATHS_HEADER = struct.Struct('=8sIIIIqq40s')
+
+
+def parse_schema_xml(path: str) -> Tuple[Dict[str, List[Tuple[str, Tuple[str, str]]]], Set[str]]:
+    """Parse the WWW SQL Designer XML and extract relations.
+
+    Returns:
+      relations: Dict[src_table, List[(dst_table, (src_col, dst_col))]]
+      tables: set of table names present in XML
+
+    We parse <table name="..."> with child <row name="..."> and inner <relation table="..." row="..." /> elements.
+    For each relation element inside a row of a table, we create an undirected edge between the current table and the referenced table with join columns (current row name, relation row).
+    """
+    relations, tables, _ = read_schema_xml(path)
+    return relations, tables
+
+
+def read_schema_xml(
+    path: str
+) -> Tuple[Dict[str, List[Tuple[str, Tuple[str, str]]]], Set[str], Dict[str, Set[str]]]:
+    """Like parse_schema_xml, plus the indexed key columns per table.
+
+    The third value maps table name to the leading columns of its PRIMARY,
+    UNIQUE and INDEX keys, the columns a join can seek on.
+    """
+    tree = ET.parse(path)
+    root = tree.getroot()
+    relations: Dict[str, List[Tuple[str, Tuple[str, str]]]] = defaultdict(list)
+    tables: Set[str] = set()
+    key_columns: Dict[str, Set[str]] = defaultdict(set)
+
+    for table in root.findall('.//table'):
+        tname = table.get('name')
+        if not tname:
+            continue
+        tables.add(tname)
+        for key in table.findall('key'):
+            parts = [part.text.strip() for part in key.findall('part') if part.text and part.text.strip()]
+            if parts and (key.get('type') or '').upper() in INDEXED_KEY_TYPES:
+                key_columns[tname].add(parts[0])
+        for row in table.findall('row'):
+            src_col = row.get('name')
+            if not src_col:
+                continue
+            for rel in row.findall('relation'):
+                dst_table = rel.get('table')
+                dst_col = rel.get('row')
+                if dst_table and dst_col:
+                    # add bidirectional edge
+                    relations[tname].append((dst_table, (src_col, dst_col)))
+                    relations[dst_table].append((tname, (dst_col, src_col)))
+                    tables.add(dst_table)
+    return relations, tables, key_columns
+
+
+class RelationGraph:
+    """Undirected join graph with integer table ids and CSR adjacency arrays."""
+
+    def __init__(
+        self,
+        relations: Dict[str, List[Tuple[str, Tuple[str, str]]]],
+        tables: Iterable[str],
+        key_columns: Optional[Dict[str, Set[str]]] = None,
+    ) -> None:
+        self.tables: List[str] = sorted(tables)
+        self.table_ids: Dict[str, int] = {name: table_id for table_id, name in enumerate(self.tables)}
+        self.columns: List[str] = []
+        self.offsets = array('I', [0])
+        self.targets = array('I')
+        self.source_columns = array('I')
+        self.target_columns = array('I')
+        # 1 where the edge's target column is an indexed key column of the target table
+        self.target_keyed = bytearray()
+
+        key_columns = key_columns or {}
+        column_ids: Dict[str, int] = {}
+
+        def column_id(name: str) -> int:
+            if name not in column_ids:
+                column_ids[name] = len(self.columns)
+                self.columns.append(name)
+            return column_ids[name]
+
+        for name in self.tables:
+            for neighbour, (source_column, target_column) in relations.get(name, ()):
+                self.targets.append(self.table_ids[neighbour])
+                self.source_columns.append(column_id(source_column))
+                self.target_columns.append(column_id(target_column))
+                self.target_keyed.append(target_column in key_columns.get(neighbour, ()))
+            self.offsets.append(len(self.targets))
+
+    @classmethod
+    def from_xml(cls, schema_path: str) -> 'RelationGraph':
+        """Build the graph from a schema XML file."""
+        return cls(*read_schema_xml(schema_path))
+
+    def __len__(self) -> int:
+        return len(self.tables)
+
+    @property
+    def edge_count(self) -> int:
+        """Number of edge slots; every relation is stored once per direction."""
+        return len(self.targets)
+
+    def edges(self, table_id: int) -> range:
+        """Edge slots of one table (indexes into targets / source_columns / target_columns)."""
+        return range(self.offsets[table_id], self.offsets[table_id + 1])
+
+    def neighbours(self, table_id: int) -> Iterator[int]:
+        """Ids of the tables joined to table_id, in XML order (with repeats for parallel relations)."""
+        return iter(self.targets[self.offsets[table_id]:self.offsets[table_id + 1]])
+
+    def join_columns(self, slot: int) -> Tuple[str, str]:
+        """Return (column of the edge's source table, column of its target table)."""
+        return self.columns[self.source_columns[slot]], self.columns[self.target_columns[slot]]
+
+    def shortest_path(self, start: str, targets: Iterable[str]) -> List[PathStep]:
+        """Shortest join path from start to the nearest of targets (bidirectional BFS).
+
+        Returns the path as (table_name, join_info) entries: the first entry
+        is (start, None), later ones carry (previous table's column, this
+        table's column). Returns an empty list when start or every target is
+        unknown or unreachable.
+        """
+        if start not in self.table_ids:
+            return []
+        source = self.table_ids[start]
+        goals = {self.table_ids[name] for name in targets if name in self.table_ids}
+        if not goals:
+            return []
+        if source in goals:
+            return [(start, None)]
+        return [(self.tables[table_id], join) for table_id, join in self._connect({source}, goals)]
+
+    def edge_costs(self, stats: Dict[str, Tuple[int, Set[str]]], default_rows: int = DEFAULT_ROW_COUNT) -> array:
+        """Estimated cost per edge slot of joining the slot's target table (see join_cost).
+
+        stats maps lower-cased table names to (row count, lower-cased indexed
+        columns) as returned by read_table_stats; other tables count as
+        default_rows rows. Key columns from the schema XML are always indexed.
+        """
+        costs = array('d')
+        for slot, target in enumerate(self.targets):
+            rows, indexed = stats.get(self.tables[target].lower(), (default_rows, ()))
+            column = self.columns[self.target_columns[slot]]
+            costs.append(join_cost(rows, bool(self.target_keyed[slot]) or column.lower() in indexed))
+        return costs
+
+    def cheapest_path(self, start: str, targets: Iterable[str], costs: array) -> Tuple[float, List[PathStep]]:
+        """Cheapest join path from start to the nearest of targets under edge costs (Dijkstra).
+
+        Returns (estimated cost, path) with the path shaped like
+        shortest_path; among equally cheap paths the one with fewer joins
+        wins. Returns (inf, []) when no target is reachable.
+        """
+        if start not in self.table_ids:
+            return math.inf, []
+        source = self.table_ids[start]
+        goals = {self.table_ids[name] for name in targets if name in self.table_ids}
+        if not goals:
+            return math.inf, []
+        if source in goals:
+            return 0.0, [(start, None)]
+        cost, path = self._cheapest_connect({source}, goals, costs)
+        return cost, [(self.tables[table_id], join) for table_id, join in path]
+
+    def steiner_tree(self, terminals: Iterable[str], costs: Optional[array] = None) -> List[TreeStep]:
+        """Near-minimal join tree connecting all terminal tables (Takahashi-Matsuyama heuristic).
+
+        The tree grows from one terminal by repeatedly attaching the closest
+        remaining terminal along a shortest path to any table already in the
+        tree. Every terminal is tried as the root and the tree with the fewest
+        tables wins. With edge costs (see edge_costs) "closest" and "fewest"
+        mean lowest estimated cost instead. Returns (table_name, join_info) entries where each table
+        joins a table listed before it: the root has join_info None, the
+        others (parent table, parent's column, this table's column). Returns
+        an empty list when a terminal is unknown or not connected to the rest.
+        """
+        ids: List[int] = []
+        for name in terminals:
+            if name not in self.table_ids:
+                return []
+            if self.table_ids[name] not in ids:
+                ids.append(self.table_ids[name])
+        if not ids:
+            return []
+
+        best: List[Tuple[int, int, Optional[Tuple[str, str]]]] = []
+        best_cost = math.inf
+        for root in ids:
+            cost, tree = self._grow_tree(root, ids, costs)
+            if not tree:
+                return []
+            if not best or (cost, len(tree)) < (best_cost, len(best)):
+                best, best_cost = tree, cost
+        return [
+            (self.tables[table_id], None if parent < 0 else (self.tables[parent], join[0], join[1]))
+            for table_id, parent, join in best
+        ]
+
+    def k_shortest_paths(
+        self, start: str, target: str, k: int, costs: Optional[array] = None
+    ) -> List[Tuple[float, List[PathStep]]]:
+        """Up to k loopless join paths from start to target, best first (Yen's algorithm).
+
+        Paths are ranked by number of joins or, with edge costs (see
+        edge_costs), by estimated cost and then joins. Different relations
+        between the same two tables make different paths. Returns (cost,
+        path) pairs with paths shaped like shortest_path; without edge costs
+        the cost is the number of joins.
+
+        Uses Lawler's refinement (a new path only spurs from its deviation
+        point onwards) and runs every spur search as a bidirectional BFS that
+        skips the tables of the root path. With costs the spur searches are
+        A* instead, guided by the exact cost-to-target of every table in the
+        unrestricted graph, computed once per call.
+        """
+        if k < 1 or start not in self.table_ids or target not in self.table_ids:
+            return []
+        source = self.table_ids[start]
+        goal = self.table_ids[target]
+        if source == goal:
+            return [(0.0, [(start, None)])]
+
+        remaining = self._costs_to(goal, costs) if costs is not None else None
+        first = self._spur_slots(source, goal, set(), set(), costs, remaining)
+        if first is None:
+            return []
+        accepted: List[Tuple[float, Tuple[int, ...], int]] = [(self._slots_cost(first, costs), first, 0)]
+        # candidate paths: (cost, joins, edge slots, index of the table they deviate at)
+        candidates: List[Tuple[float, int, Tuple[int, ...], int]] = []
+        seen = {first}
+        while len(accepted) < k:
+            _, previous, deviation = accepted[-1]
+            tables = [source] + [self.targets[slot] for slot in previous]
+            for index in range(deviation, len(previous)):
+                root = previous[:index]
+                used = {slots[index] for _, slots, _ in accepted if len(slots) > index and slots[:index] == root}
+                spur = self._spur_slots(tables[index], goal, set(tables[:index]), used, costs, remaining)
+                if spur is None or root + spur in seen:
+                    continue
+                path = root + spur
+                seen.add(path)
+                heapq.heappush(candidates, (self._slots_cost(path, costs), len(path), path, index))
+            if not candidates:
+                break
+            cost, _, path, index = heapq.heappop(candidates)
+            accepted.append((cost, path, index))
+
+        return [
+            (cost, [(start, None)] + [(self.tables[self.targets[slot]], self.join_columns(slot)) for slot in slots])
+            for cost, slots, _ in accepted
+        ]
+
+    def _spur_slots(
+        self, spur: int, goal: int, banned: Set[int], banned_slots: Set[int], costs: Optional[array],
+        remaining: Optional[List[float]] = None,
+    ) -> Optional[Tuple[int, ...]]:
+        """Edge slots of the best path from spur to goal that avoids banned tables and leaves spur by no banned slot.
+
+        Duplicate relations (same tables and columns) count as one: banning a
+        slot bans its duplicates, and paths always use the first of them.
+        """
+        banned_edges = {self._edge_key(slot) for slot in banned_slots}
+        # cheapest allowed first step per neighbour; the search then starts from these neighbours
+        first: Dict[int, int] = {}
+        for slot in self.edges(spur):
+            neighbour = self.targets[slot]
+            if neighbour in banned or neighbour == spur or self._edge_key(slot) in banned_edges:
+                continue
+            if neighbour not in first or (costs is not None and costs[slot] < costs[first[neighbour]]):
+                first[neighbour] = slot
+        if not first:
+            return None
+
+        blocked = banned | {spur}
+        if costs is not None:
+            _, path = self._cheapest_connect(
+                set(first), {goal}, costs, blocked, {table_id: costs[slot] for table_id, slot in first.items()}, remaining
+            )
+        elif goal in first:
+            path = [(goal, None)]
+        else:
+            path = self._connect(set(first), {goal}, blocked)
+        if not path:
+            return None
+
+        slots = [first[path[0][0]]]
+        for (previous, _), (table_id, join) in zip(path, path[1:]):
+            slots.append(next(
+                slot for slot in self.edges(previous)
+                if self.targets[slot] == table_id and self.join_columns(slot) == join
+            ))
+        return tuple(slots)
+
+    def _edge_key(self, slot: int) -> Tuple[int, int, int]:
+        return self.targets[slot], self.source_columns[slot], self.target_columns[slot]
+
+    @staticmethod
+    def _slots_cost(slots: Tuple[int, ...], costs: Optional[array]) -> float:
+        return float(len(slots)) if costs is None else sum(costs[slot] for slot in slots)
+
+    def _grow_tree(
+        self, root: int, terminals: List[int], costs: Optional[array] = None
+    ) -> Tuple[float, List[Tuple[int, int, Optional[Tuple[str, str]]]]]:
+        """One Takahashi-Matsuyama run from root.
+
+        Returns (tree cost, [(table id, parent id or -1, join columns)]) in
+        join order; without costs the tree cost is its number of joins.
+        """
+        tree: List[Tuple[int, int, Optional[Tuple[str, str]]]] = [(root, -1, None)]
+        total = 0.0
+        in_tree = {root}
+        remaining = set(terminals) - in_tree
+        while remaining:
+            if costs is None:
+                path = self._connect(in_tree, remaining)
+                total += len(path) - 1
+            else:
+                cost, path = self._cheapest_connect(in_tree, remaining, costs)
+                total += cost
+            if not path:
+                return math.inf, []
+            parent = path[0][0]
+            for table_id, join in path[1:]:
+                tree.append((table_id, parent, join))
+                in_tree.add(table_id)
+                parent = table_id
+            remaining -= in_tree
+        return total, tree
+
+    def _connect(
+        self, sources: Set[int], goals: Set[int], banned: Iterable[int] = ()
+    ) -> List[Tuple[int, Optional[Tuple[str, str]]]]:
+        """Bidirectional BFS between two disjoint table sets, avoiding the banned tables.
+
+        Returns the shortest path as (table id, join columns) from one of
+        sources to one of goals, or an empty list if none is reachable.
+        """
+        # node -> (neighbour towards the search root, edge slot from that neighbour), -1 for roots;
+        # banned tables count as visited by both sides, so neither expands or meets on them
+        forward: Dict[int, Tuple[int, int]] = dict.fromkeys(banned, (-2, -2))
+        backward: Dict[int, Tuple[int, int]] = dict(forward)
+        forward.update((source, (-1, -1)) for source in sources)
+        backward.update((goal, (-1, -1)) for goal in goals)
+        forward_frontier = list(sources)
+        backward_frontier = list(goals)
+
+        meeting = -1
+        while forward_frontier and backward_frontier and meeting < 0:
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meeting = self._expand(forward_frontier, forward, backward)
+            else:
+                backward_frontier, meeting = self._expand(backward_frontier, backward, forward)
+
+        if meeting < 0:
+            return []
+        return self._join_halves(meeting, forward, backward)
+
+    def _cheapest_connect(
+        self, sources: Set[int], goals: Set[int], costs: array, banned: Iterable[int] = (),
+        start_costs: Optional[Dict[int, float]] = None, remaining: Optional[List[float]] = None,
+    ) -> Tuple[float, List[Tuple[int, Optional[Tuple[str, str]]]]]:
+        """Dijkstra from all sources to the nearest goal, avoiding the banned tables.
+
+        start_costs optionally gives sources an initial cost. remaining turns
+        the search into A*: a lower bound per table of the cost still needed
+        to reach a goal (see _costs_to); tables with an infinite bound are
+        skipped. Returns (cost, path) like _connect, or (inf, []).
+        """
+        targets = self.targets
+        offsets = self.offsets
+        start_costs = start_costs or {}
+        # node -> (cost, joins) of the best known path and (previous table, edge slot) it arrives by
+        best: Dict[int, Tuple[float, int]] = {source: (start_costs.get(source, 0.0), 0) for source in sources}
+        parent: Dict[int, Tuple[int, int]] = {source: (-1, -1) for source in sources}
+        heap = [
+            (cost + (remaining[source] if remaining else 0.0), joins, source)
+            for source, (cost, joins) in best.items()
+        ]
+        heapq.heapify(heap)
+        done: Set[int] = set(banned)
+        while heap:
+            _, _, table_id = heapq.heappop(heap)
+            if table_id in done:
+                continue
+            cost, joins = best[table_id]
+            if table_id in goals:
+                return cost, self._join_halves(table_id, parent, {table_id: (-1, -1)})
+            done.add(table_id)
+            for slot in range(offsets[table_id], offsets[table_id + 1]):
+                neighbour = targets[slot]
+                if neighbour in done:
+                    continue
+                candidate = (cost + costs[slot], joins + 1)
+                if neighbour not in best or candidate < best[neighbour]:
+                    bound = remaining[neighbour] if remaining else 0.0
+                    if bound == math.inf:
+                        continue
+                    best[neighbour] = candidate
+                    parent[neighbour] = (table_id, slot)
+                    heapq.heappush(heap, (candidate[0] + bound, candidate[1], neighbour))
+        return math.inf, []
+
+    def _costs_to(self, goal: int, costs: array) -> List[float]:
+        """Cheapest cost from every table to goal (Dijkstra over reversed edges); inf where goal is unreachable."""
+        incoming: List[List[Tuple[int, int]]] = [[] for _ in range(len(self))]
+        for table_id in range(len(self)):
+            for slot in self.edges(table_id):
+                incoming[self.targets[slot]].append((table_id, slot))
+
+        distance = [math.inf] * len(self)
+        distance[goal] = 0.0
+        heap = [(0.0, goal)]
+        while heap:
+            cost, table_id = heapq.heappop(heap)
+            if cost > distance[table_id]:
+                continue
+            for neighbour, slot in incoming[table_id]:
+                candidate = cost + costs[slot]
+                if candidate < distance[neighbour]:
+                    distance[neighbour] = candidate
+                    heapq.heappush(heap, (candidate, neighbour))
+        return distance
+
+    def _expand(
+        self, frontier: List[int], visited: Dict[int, Tuple[int, int]], other: Dict[int, Tuple[int, int]]
+    ) -> Tuple[List[int], int]:
+        """Expand one BFS level; returns (next frontier, first table also seen by the other side or -1).
+
+        The first meeting already closes a shortest path: any table the other
+        side reached at less than its frontier depth would have met this side
+        on an earlier level.
+        """
+        targets = self.targets
+        offsets = self.offsets
+        next_frontier: List[int] = []
+        for table_id in frontier:
+            for slot in range(offsets[table_id], offsets[table_id + 1]):
+                neighbour = targets[slot]
+                if neighbour in visited:
+                    continue
+                visited[neighbour] = (table_id, slot)
+                if neighbour in other:
+                    return next_frontier, neighbour
+                next_frontier.append(neighbour)
+        return next_frontier, -1
+
+    def _join_halves(
+        self, meeting: int, forward: Dict[int, Tuple[int, int]], backward: Dict[int, Tuple[int, int]]
+    ) -> List[Tuple[int, Optional[Tuple[str, str]]]]:
+        """Stitch the forward and backward parent chains at the meeting table into one path."""
+        path: List[Tuple[int, Optional[Tuple[str, str]]]] = []
+        table_id = meeting
+        while True:
+            previous, slot = forward[table_id]
+            if previous < 0:
+                path.append((table_id, None))
+                break
+            path.append((table_id, self.join_columns(slot)))
+            table_id = previous
+        path.reverse()
+
+        table_id = meeting
+        while True:
+            following, slot = backward[table_id]
+            if following < 0:
+                break
+            # slot runs following -> table_id; the path walks it the other way round
+            this_column, previous_column = self.join_columns(slot)
+            path.append((following, (previous_column, this_column)))
+            table_id = following
+        return path
+
+
+def join_cost(rows: int, indexed: bool) -> float:
+    """Estimated rows touched to join a table of rows rows: a B-tree seek if the join column is indexed, else a scan."""
+    return 1.0 + (math.log2(rows + 1) if indexed else rows)
+
+
+def read_table_stats(path: str) -> Dict[str, Tuple[int, Set[str]]]:
+    """Read a table statistics file: lower-cased table name -> (row count, lower-cased indexed columns).
+
+    Comma or tab delimited, with a header naming TableName and RowCount and
+    optionally IndexedColumns (';'-separated leading index columns).
+    Schema-qualified names are reduced to the table name like in the schema
+    XML; rows without a numeric row count are skipped.
+    """
+    stats: Dict[str, Tuple[int, Set[str]]] = {}
+    rows = iter_csv_rows(path)
+    header = next(rows, None)
+    if header is None:
+        return stats
+    fields = [cell.replace('_', '').lower() for cell in header]
+    if 'tablename' not in fields or 'rowcount' not in fields:
+        raise ValueError(f'{path}: header must name TableName and RowCount columns')
+    table_at = fields.index('tablename')
+    rows_at = fields.index('rowcount')
+    indexed_at = fields.index('indexedcolumns') if 'indexedcolumns' in fields else -1
+
+    for row in rows:
+        if len(row) <= max(table_at, rows_at):
+            continue
+        try:
+            row_count = int(float(row[rows_at]))
+        except ValueError:
+            continue
+        indexed: Set[str] = set()
+        if 0 <= indexed_at < len(row):
+            indexed = {column.strip().lower() for column in row[indexed_at].split(';') if column.strip()}
+        stats[row[table_at].rsplit('.', 1)[-1].lower()] = (row_count, indexed)
+    return stats
+
+
+def load_relation_graph(schema_path: str) -> RelationGraph:
+    """Return the relation graph of schema_path, cached in ``<schema_path>.graph.cache``."""
+    return load_cached(
+        schema_path, f'{schema_path}.graph.cache', lambda: RelationGraph.from_xml(schema_path), 'relation-graph'
+    )
+
+
+def connected_components(graph: RelationGraph) -> List[List[int]]:
+    """Return the table ids of every connected component, ordered by their smallest id."""
+    component_of = [-1] * len(graph)
+    components: List[List[int]] = []
+    for root in range(len(graph)):
+        if component_of[root] >= 0:
+            continue
+        component_of[root] = len(components)
+        members = [root]
+        for table_id in members:
+            for neighbour in graph.neighbours(table_id):
+                if component_of[neighbour] < 0:
+                    component_of[neighbour] = len(components)
+                    members.append(neighbour)
+        members.sort()
+        components.append(members)
+    return components
+
+
+def next_hop_matrix(graph: RelationGraph, members: List[int], no_hop: int) -> array:
+    """Row-major next-hop matrix of one component.
+
+    Entry [source][target] is the position, within source's adjacency slice,
+    of the first edge on a shortest path to target.
+
+    Runs one BFS per target over the undirected graph; when several
+    relations join the same two tables the first declared one is used.
+    """
+    size = len(members)
+    local = {table_id: index for index, table_id in enumerate(members)}
+    # joined[v] = [(u, position of u's first edge to v), ...] over local indexes, one entry per neighbour
+    joined: List[List[Tuple[int, int]]] = [[] for _ in members]
+    for index, table_id in enumerate(members):
+        seen: Set[int] = set()
+        for position, slot in enumerate(graph.edges(table_id)):
+            neighbour = local[graph.targets[slot]]
+            if neighbour not in seen:
+                seen.add(neighbour)
+                joined[neighbour].append((index, position))
+
+    hops = array('H' if no_hop == 0xFFFF else 'I', [no_hop]) * (size * size)
+    for target in range(size):
+        reached = bytearray(size)
+        reached[target] = 1
+        frontier = [target]
+        for table_id in frontier:
+            for neighbour, position in joined[table_id]:
+                if not reached[neighbour]:
+                    reached[neighbour] = 1
+                    frontier.append(neighbour)
+                    hops[neighbour * size + target] = position
+    return hops
+
+
+def paths_file_for(schema_path: str) -> str:
+    """Location of the precomputed next-hop file of a schema XML."""
+    return f'{schema_path}.paths'
+
+
+def build_path_file(schema_path: str, graph: Optional[RelationGraph] = None) -> str:
+    """Precompute all-pairs next hops for schema_path and write them to its paths file; returns the file path."""
+    if graph is None:
+        graph = load_relation_graph(schema_path)
+    stat = os.stat(schema_path)
+    digest = file_digest(schema_path).encode('ascii')
+    components = connected_components(graph)
+
+    max_degree = max((graph.offsets[t + 1] - graph.offsets[t] for t in range(len(graph))), default=0)
+    no_hop = 0xFFFF if max_degree < 0xFFFF else 0xFFFFFFFF
+    matrix_offsets = array('Q', [0])
+    component_of = array('I', [0]) * len(graph)
+    local_index = array('I', [0]) * len(graph)
+    for component_id, members in enumerate(components):
+        for index, table_id in enumerate(members):
+            component_of[table_id] = component_id
+            local_index[table_id] = index
+        matrix_offsets.append(matrix_offsets[-1] + len(members) * len(members))
+
+    target_path = paths_file_for(schema_path)
+    temp_path = f'{target_path}.{os.getpid()}.tmp'
+    try:
+        with open(temp_path, 'wb') as handle:
+            handle.write(PATHS_HEADER.pack(
+                PATHS_MAGIC, PATHS_VERSION, 2 if no_hop == 0xFFFF else 4, len(graph), len(components),
+                stat.st_size, stat.st_mtime_ns, digest,
+            ))
+            for values in (matrix_offsets, component_of, local_index):
+                values.tofile(handle)
+            for members in components:
+                next_hop_matrix(graph, members, no_hop).tofile(handle)
+        os.replace(temp_path, target_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return target_path
+
+
+class NextHopTable:
+    """Memory-mapped next-hop matrices written by build_path_file."""
+
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, item_size, self.table_count, component_count,
+             self.source_size, self.source_mtime_ns, digest) = PATHS_HEADER.unpack_from(self._map)
+            if magic != PATHS_MAGIC or version != PATHS_VERSION or item_size not in (2, 4):
+                raise ValueError(f'{path} is not a join paths file')
+            self.source_sha1 = digest.decode('ascii')
+
+            # Validate the length before any memoryview pins the map; the last offset is the hop count
+            offsets_end = PATHS_HEADER.size + 8 * (component_count + 1)
+            if len(self._map) < offsets_end:
+                raise ValueError(f'{path} is truncated')
+            hop_count, = struct.unpack_from('=Q', self._map, offsets_end - 8)
+            if len(self._map) != offsets_end + 8 * self.table_count + item_size * hop_count:
+                raise ValueError(f'{path} is truncated')
+        except (ValueError, struct.error):
+            self._map.close()
+            raise
+
+        self._view = memoryview(self._map)
+        position = PATHS_HEADER.size
+        self.matrix_offsets = self._view[position:offsets_end].cast('Q')
+        position = offsets_end
+        self.component_of = self._view[position:position + 4 * self.table_count].cast('I')
+        position += 4 * self.table_count
+        self.local_index = self._view[position:position + 4 * self.table_count].cast('I')
+        position += 4 * self.table_count
+        self.hops = self._view[position:].cast('H' if item_size == 2 else 'I')
+
+    def close(self) -> None:
+        """Release the views into the file, then unmap it (the map cannot close while views exist)."""
+        for view in (self.matrix_offsets, self.component_of, self.local_index, self.hops, self._view):
+            view.release()
+        self._map.close()
+
+    def matches(self, schema_path: str) -> bool:
+        """True while schema_path is still the XML this table was built from."""
+        stat = os.stat(schema_path)
+        if stat.st_size != self.source_size:
+            return False
+        return stat.st_mtime_ns == self.source_mtime_ns or file_digest(schema_path) == self.source_sha1
+
+    def next_slot(self, graph: RelationGraph, source: int, target: int) -> int:
+        """Edge slot of the first step from source towards target; -1 if unreachable or equal."""
+        component = self.component_of[source]
+        if component != self.component_of[target] or source == target:
+            return -1
+        start = self.matrix_offsets[component]
+        size = isqrt(self.matrix_offsets[component + 1] - start)
+        hop = self.hops[start + self.local_index[source] * size + self.local_index[target]]
+        return graph.offsets[source] + hop
+
+    def shortest_path(self, graph: RelationGraph, start: str, targets: Iterable[str]) -> List[PathStep]:
+        """Same result shape as RelationGraph.shortest_path, answered by walking next hops."""
+        if start not in graph.table_ids:
+            return []
+        source = graph.table_ids[start]
+        best: List[PathStep] = []
+        for name in targets:
+            target = graph.table_ids.get(name)
+            if target is None:
+                continue
+            if target == source:
+                return [(start, None)]
+            path: List[PathStep] = [(start, None)]
+            table_id = source
+            while table_id != target and (not best or len(path) < len(best)):
+                slot = self.next_slot(graph, table_id, target)
+                if slot < 0:
+                    break
+                table_id = graph.targets[slot]
+                path.append((graph.tables[table_id], graph.join_columns(slot)))
+            if table_id == target and (not best or len(path) < len(best)):
+                best = path
+        return best
+
+
+def load_path_table(schema_path: str, graph: RelationGraph) -> Optional[NextHopTable]:
+    """Open the paths file of schema_path; None if it is missing, unreadable or built from another XML."""
+    try:
+        table = NextHopTable(paths_file_for(schema_path))
+    except (OSError, ValueError, struct.error):
+        return None
+    try:
+        current = table.table_count == len(graph) and table.matches(schema_path)
+    except OSError:
+        current = False
+    if not current:
+        table.close()
+        return None
+    return table
@@ -12,14 +12,31 @@ Input files (located inside a selected dataset folder under ``0-data/``):
 
 Output:
 - ``<dataset>-schema.xml`` written to the same dataset folder as the input CSV files (e.g., ``0-data/<dataset>/``)
+
+Options:
+- ``--gzip``: write ``<dataset>-schema.xml.gz`` (gzip-compressed) instead of the plain XML.
+  join_cols.py and the designer's "load XML" dialog read the plain file, so
+  gunzip it before using it there.
 """
 
+import argparse
 import csv
+import gzip
 import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
 from collections import defaultdict
+import heapq
 import os
 import math
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; placement falls back to the pure-Python search
+    np = None
+
+# Extra entities for attribute values (quotes end the attribute, newlines/tabs would be normalized)
+XML_ATTR_ENTITIES = {'"': '&quot;', '\n': '&#10;', '\r': '&#13;', '\t': '&#9;'}
+
 class Table:
     """Represents a database table with its columns and keys"""
     def __init__(self, name):
@@ -100,17 +117,283 @@ class Column:
         self.foreign_keys.append((referenced_table, referenced_column))
         self.is_foreign = True
 
+def xml_text(value):
+    """Escape a value for use as XML character data"""
+    return escape(str(value))
+
+def xml_attr(value):
+    """Escape a value for use inside a double-quoted XML attribute"""
+    return escape(str(value), XML_ATTR_ENTITIES)
+
+class XmlStreamWriter:
+    """Buffered UTF-8 writer for large XML documents, optionally gzip-compressed
+
+    Small ``write`` calls are collected in memory and flushed to disk in
+    chunks of roughly ``chunk_size`` characters, so memory stays bounded no
+    matter how large the document grows.
+    """
+    def __init__(self, path, compress=False, chunk_size=1 << 20):
+        self.path = path
+        self.compress = compress
+        self.chunk_size = chunk_size
+        self.buffer = []
+        self.buffered = 0
+        self.handle = None
+
+    def __enter__(self):
+        if self.compress:
+            self.handle = gzip.open(self.path, 'wb')
+        else:
+            self.handle = open(self.path, 'wb')
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.flush()
+        finally:
+            self.handle.close()
+        return False
+
+    def write(self, text):
+        """Queue text for writing, flushing once the buffer is full"""
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if self.buffered >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Encode and write all buffered text"""
+        if self.buffer:
+            self.handle.write(''.join(self.buffer).encode('utf-8'))
+            self.buffer = []
+            self.buffered = 0
+
+class TableGraph:
+    """Table adjacency built once from the foreign-key rows
+
+    ``outgoing`` maps each table to the distinct tables it references,
+    ``incoming`` to the distinct other tables referencing it (self-references
+    only count as outgoing, matching the original connection counting).
+    """
+    def __init__(self, tables):
+        self.outgoing = {}  # table_name -> set of referenced table names
+        self.incoming = {}  # table_name -> set of referencing table names
+        for table_name in tables:
+            self.outgoing[table_name] = set()
+            self.incoming[table_name] = set()
+
+        for table_name, table in tables.items():
+            for column in table.columns.values():
+                for ref_table, ref_column in column.foreign_keys:
+                    self.outgoing[table_name].add(ref_table)
+                    if ref_table != table_name:
+                        self.incoming.setdefault(ref_table, set()).add(table_name)
+
+        self.out_degree = {name: len(refs) for name, refs in self.outgoing.items()}
+        self.in_degree = {name: len(refs) for name, refs in self.incoming.items()}
+
+    def degree(self, table_name):
+        """Total bi-directional connection count of a table"""
+        return self.in_degree.get(table_name, 0) + self.out_degree.get(table_name, 0)
+
+    def neighbors(self, table_name):
+        """All tables connected to the given table in either direction"""
+        return self.outgoing.get(table_name, set()) | self.incoming.get(table_name, set())
+
+class LinearSpatialIndex:
+    """Reference spatial index that tests every stored rectangle (O(n) per query)"""
+    def __init__(self):
+        self.rects = []  # list of (x1, y1, x2, y2) tuples
+
+    def insert(self, x1, y1, x2, y2):
+        """Store a rectangle"""
+        self.rects.append((x1, y1, x2, y2))
+
+    def intersects(self, x1, y1, x2, y2):
+        """Return True if the rectangle overlaps any stored rectangle (touching edges do not count)"""
+        for ox1, oy1, ox2, oy2 in self.rects:
+            if not (x2 <= ox1 or x1 >= ox2 or y2 <= oy1 or y1 >= oy2):
+                return True
+        return False
+
+class GridSpatialIndex:
+    """Uniform grid (bucket hash) spatial index for occupied rectangles
+
+    Every rectangle is registered in each grid cell it covers, so an overlap
+    query only tests the rectangles sharing a cell with the query rectangle.
+    Table-sized queries touch a handful of cells, which keeps the cost per
+    query roughly constant regardless of how many tables are already placed.
+    """
+    def __init__(self, cell_size=200):
+        self.cell_size = cell_size
+        self.rects = []  # list of (x1, y1, x2, y2) tuples, indexed by rect id
+        self.cells = defaultdict(list)  # (cell_x, cell_y) -> list of rect ids
+
+    def _cell_range(self, x1, y1, x2, y2):
+        """Return the inclusive cell index ranges covered by a rectangle"""
+        size = self.cell_size
+        return (int(math.floor(x1 / size)), int(math.floor(x2 / size)),
+                int(math.floor(y1 / size)), int(math.floor(y2 / size)))
+
+    def insert(self, x1, y1, x2, y2):
+        """Store a rectangle and register it in every cell it covers"""
+        rect_id = len(self.rects)
+        self.rects.append((x1, y1, x2, y2))
+        cx1, cx2, cy1, cy2 = self._cell_range(x1, y1, x2, y2)
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                self.cells[(cx, cy)].append(rect_id)
+
+    def intersects(self, x1, y1, x2, y2):
+        """Return True if the rectangle overlaps any stored rectangle (touching edges do not count)"""
+        rects = self.rects
+        cells = self.cells
+        seen = set()
+        cx1, cx2, cy1, cy2 = self._cell_range(x1, y1, x2, y2)
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for rect_id in bucket:
+                    if rect_id in seen:
+                        continue
+                    seen.add(rect_id)
+                    ox1, oy1, ox2, oy2 = rects[rect_id]
+                    if not (x2 <= ox1 or x1 >= ox2 or y2 <= oy1 or y1 >= oy2):
+                        return True
+        return False
+
+class NumpyPlacementEngine:
+    """Vectorized candidate-position search backed by NumPy
+
+    Mirrors the occupied rectangles in a float array and tests whole batches of
+    candidate positions against it at once. Candidates are generated in the
+    same order as the pure-Python loops (radius by radius, angle by angle, or
+    row by row for grids) and cos/sin come from ``math``, so the first free
+    candidate -- and therefore the layout -- is identical to the loop version.
+    """
+    # Upper bound for candidates x rectangles compared in one batch
+    BATCH_CELLS = 1 << 20
+
+    def __init__(self, margin):
+        self.margin = margin
+        self.rects = np.empty((64, 4), dtype=np.float64)  # rows of (x1, y1, x2, y2)
+        self.count = 0
+        self._angle_tables = {}  # angle_step -> (cos array, sin array)
+
+    def insert(self, x1, y1, x2, y2):
+        """Store an occupied rectangle (margin already included)"""
+        if self.count == len(self.rects):
+            self.rects = np.concatenate([self.rects, np.empty_like(self.rects)])
+        self.rects[self.count] = (x1, y1, x2, y2)
+        self.count += 1
+
+    def _angles(self, angle_step):
+        """Return cached cos/sin arrays for range(0, 360, angle_step)"""
+        if angle_step not in self._angle_tables:
+            radians = [math.radians(angle) for angle in range(0, 360, angle_step)]
+            self._angle_tables[angle_step] = (
+                np.array([math.cos(rad) for rad in radians]),
+                np.array([math.sin(rad) for rad in radians]),
+            )
+        return self._angle_tables[angle_step]
+
+    def first_free(self, xs, ys, width, height):
+        """Return the index of the first candidate whose area is free, or -1"""
+        margin = self.margin
+        rects = self.rects[:self.count]
+        if not len(xs):
+            return -1
+        if not len(rects):
+            return 0
+
+        batch = max(1, self.BATCH_CELLS // len(rects))
+        for start in range(0, len(xs), batch):
+            bx = xs[start:start + batch]
+            by = ys[start:start + batch]
+            x1 = bx - margin
+            y1 = by - margin
+            x2 = bx + width + margin
+            y2 = by + height + margin
+
+            # Only rectangles touching the bounding box of this batch can overlap
+            near = rects[(rects[:, 0] < x2.max()) & (rects[:, 2] > x1.min()) &
+                         (rects[:, 1] < y2.max()) & (rects[:, 3] > y1.min())]
+            if not len(near):
+                return start
+
+            overlaps = ((x2[:, None] > near[None, :, 0]) & (x1[:, None] < near[None, :, 2]) &
+                        (y2[:, None] > near[None, :, 1]) & (y1[:, None] < near[None, :, 3]))
+            free = ~overlaps.any(axis=1)
+            if free.any():
+                return start + int(np.argmax(free))
+        return -1
+
+    def ring_candidates(self, center_x, center_y, radii, angle_step):
+        """Return candidate x/y arrays on rings around a point (radius-major, angle-minor order)"""
+        cos, sin = self._angles(angle_step)
+        radii = np.asarray(radii, dtype=np.int64)[:, None]
+        xs = (center_x + radii * cos[None, :]).ravel()
+        ys = (center_y + radii * sin[None, :]).ravel()
+        return xs, ys
+
+    def first_free_on_rings(self, center_x, center_y, radii, angle_step, width, height, canvas_width, canvas_height):
+        """Vectorized form of the truncate-and-bounds-check ring search"""
+        xs, ys = self.ring_candidates(center_x, center_y, radii, angle_step)
+        xs = np.trunc(xs)
+        ys = np.trunc(ys)
+        inside = ((10 <= xs) & (xs <= canvas_width - width - 10) &
+                  (10 <= ys) & (ys <= canvas_height - height - 10))
+        xs = xs[inside]
+        ys = ys[inside]
+        index = self.first_free(xs, ys, width, height)
+        if index < 0:
+            return None
+        return int(xs[index]), int(ys[index])
+
+    def first_free_on_rings_clamped(self, center_x, center_y, radii, angle_step, width, height, canvas_width, canvas_height):
+        """Vectorized form of the clamp-to-canvas ring search used around anchor tables"""
+        xs, ys = self.ring_candidates(center_x, center_y, radii, angle_step)
+        xs = np.maximum(10, np.minimum(xs - width // 2, canvas_width - width - 10))
+        ys = np.maximum(10, np.minimum(ys - height // 2, canvas_height - height - 10))
+        index = self.first_free(xs, ys, width, height)
+        if index < 0:
+            return None
+        return float(xs[index]), float(ys[index])
+
+    def first_free_in_grid(self, x_values, y_values, width, height):
+        """Vectorized row-by-row grid search (y outer loop, x inner loop)"""
+        x_values = np.asarray(x_values, dtype=np.int64)
+        y_values = np.asarray(y_values, dtype=np.int64)
+        if not len(x_values) or not len(y_values):
+            return None
+        xs = np.tile(x_values, len(y_values))
+        ys = np.repeat(y_values, len(x_values))
+        index = self.first_free(xs, ys, width, height)
+        if index < 0:
+            return None
+        return int(xs[index]), int(ys[index])
+
 class SchemaGenerator:
     """Generates XML schema from CSV key files"""
     
     # Global margin for table spacing
     MARGIN = 10
     
-    def __init__(self, primary_keys_file, foreign_keys_file):
+    def __init__(self, primary_keys_file, foreign_keys_file, spatial_index=None, use_numpy=True):
         self.primary_keys_file = primary_keys_file
         self.foreign_keys_file = foreign_keys_file
         self.tables = {}  # table_name -> Table object
+        self.graph = None  # TableGraph, built by calculate_table_connections
+        self.table_entries = {}  # table_name -> table_of_tables entry, built during clustering
         self.occupied_areas = []  # Track all occupied rectangular areas
+        # Spatial index answering overlap queries against occupied_areas
+        # (any object with insert/intersects, e.g. LinearSpatialIndex for debugging)
+        self.spatial_index = spatial_index if spatial_index is not None else GridSpatialIndex()
+        # Vectorized candidate search when NumPy is available (None -> pure-Python loops)
+        self.placement_engine = NumpyPlacementEngine(self.MARGIN) if use_numpy and np is not None else None
     
     def read_primary_keys(self):
         """Read primary key definitions from TSV (tab-delimited)"""
@@ -165,28 +448,12 @@ class SchemaGenerator:
     
     def calculate_table_connections(self):
         """Calculate bi-directional connection counts for all tables"""
-        # Reset all connection counts
-        for table in self.tables.values():
-            table.connections = 0
-            table.incoming_connections = 0
-            table.outgoing_connections = 0
-        
-        # Count outgoing connections (foreign keys from this table)
-        for table_name, table in self.tables.items():
-            connected_tables = table.get_connected_tables()
-            table.outgoing_connections = len(connected_tables)
+        # Build the adjacency once; degrees are then plain dictionary lookups
+        self.graph = TableGraph(self.tables)
         
-        # Count incoming connections (foreign keys pointing to this table)
         for table_name, table in self.tables.items():
-            incoming_count = 0
-            for other_table_name, other_table in self.tables.items():
-                if other_table_name != table_name:
-                    connected_tables = other_table.get_connected_tables()
-                    incoming_count += connected_tables.count(table_name)
-            table.incoming_connections = incoming_count
-        
-        # Calculate total bi-directional connections
-        for table in self.tables.values():
+            table.outgoing_connections = self.graph.out_degree[table_name]
+            table.incoming_connections = self.graph.in_degree[table_name]
             table.connections = table.incoming_connections + table.outgoing_connections
         
         print(f"Calculated bi-directional connections for all tables")
@@ -200,7 +467,7 @@ class SchemaGenerator:
         for table_name in problem_tables:
             if table_name in self.tables:
                 table = self.tables[table_name]
-                connected_tables = table.get_connected_tables()
+                connected_tables = sorted(self.graph.outgoing[table_name])
                 print(f"  DEBUG {table_name}: {table.connections} total ({table.incoming_connections} in, {table.outgoing_connections} out) - connects to: {connected_tables}")
     
     def position_tables_intelligently(self):
@@ -269,24 +536,30 @@ class SchemaGenerator:
         best_position = None
         
         # Try multiple radii for better placement with larger initial radius
-        for radius in [300, 400, 500, 600, 700, 800, 900]:
-            for angle in range(0, 360, 10):  # Check positions every 10 degrees for better coverage
-                rad = math.radians(angle)
-                test_x = avg_x + radius * math.cos(rad) - table.width // 2
-                test_y = avg_y + radius * math.sin(rad) - table.height // 2
-            
-                # Keep within canvas bounds
-                test_x = max(10, min(test_x, canvas_width - table.width - 10))
-                test_y = max(10, min(test_y, canvas_height - table.height - 10))
+        radii = [300, 400, 500, 600, 700, 800, 900]
+        if self.placement_engine is not None:
+            # Check positions every 10 degrees, all rings in one vectorized pass
+            best_position = self.placement_engine.first_free_on_rings_clamped(
+                avg_x, avg_y, radii, 10, table.width, table.height, canvas_width, canvas_height)
+        else:
+            for radius in radii:
+                for angle in range(0, 360, 10):  # Check positions every 10 degrees for better coverage
+                    rad = math.radians(angle)
+                    test_x = avg_x + radius * math.cos(rad) - table.width // 2
+                    test_y = avg_y + radius * math.sin(rad) - table.height // 2
+                
+                    # Keep within canvas bounds
+                    test_x = max(10, min(test_x, canvas_width - table.width - 10))
+                    test_y = max(10, min(test_y, canvas_height - table.height - 10))
+                    
+                    # Check if this area is completely free
+                    if self.is_area_free(test_x, test_y, table.width, table.height):
+                        best_position = (test_x, test_y)
+                        break
                 
-                # Check if this area is completely free
-                if self.is_area_free(test_x, test_y, table.width, table.height):
-                    best_position = (test_x, test_y)
+                # If we found a free position, no need to try larger radii
+                if best_position:
                     break
-            
-            # If we found a free position, no need to try larger radii
-            if best_position:
-                break
         
         if best_position:
             table.x, table.y = best_position
@@ -312,26 +585,54 @@ class SchemaGenerator:
             'y2': y + height + self.MARGIN
         }
         self.occupied_areas.append(occupied_rect)
+        self.spatial_index.insert(occupied_rect['x1'], occupied_rect['y1'], occupied_rect['x2'], occupied_rect['y2'])
+        if self.placement_engine is not None:
+            self.placement_engine.insert(occupied_rect['x1'], occupied_rect['y1'], occupied_rect['x2'], occupied_rect['y2'])
+    
+    def find_first_free_on_rings(self, center_x, center_y, radii, angle_step, table_width, table_height):
+        """Return the first free position on rings around a point, or None
+
+        Candidates are visited radius by radius and angle by angle; coordinates
+        are truncated to integers and must lie inside the canvas.
+        """
+        if self.placement_engine is not None:
+            return self.placement_engine.first_free_on_rings(
+                center_x, center_y, radii, angle_step, table_width, table_height,
+                self.canvas_width, self.canvas_height)
+        
+        for radius in radii:
+            for angle in range(0, 360, angle_step):
+                rad = math.radians(angle)
+                test_x = int(center_x + radius * math.cos(rad))
+                test_y = int(center_y + radius * math.sin(rad))
+                
+                # Check if position is within canvas and free
+                if (10 <= test_x <= self.canvas_width - table_width - 10 and 
+                    10 <= test_y <= self.canvas_height - table_height - 10):
+                    if self.is_area_free(test_x, test_y, table_width, table_height):
+                        return test_x, test_y
+        return None
+    
+    def find_first_free_in_grid(self, x_values, y_values, width, height):
+        """Return the first free position of a grid scanned row by row, or None"""
+        if self.placement_engine is not None:
+            return self.placement_engine.first_free_in_grid(x_values, y_values, width, height)
+        
+        for y in y_values:
+            for x in x_values:
+                if self.is_area_free(x, y, width, height):
+                    return x, y
+        return None
     
     def is_area_free(self, x, y, width, height):
         """Check if a rectangular area is completely free of overlaps"""
-        test_rect = {
-            'x1': x - self.MARGIN,
-            'y1': y - self.MARGIN,
-            'x2': x + width + self.MARGIN, 
-            'y2': y + height + self.MARGIN
-        }
-        
-        # Check against all occupied areas
-        for occupied in self.occupied_areas:
-            # Check if rectangles overlap
-            if not (test_rect['x2'] <= occupied['x1'] or  # test is completely to the left
-                   test_rect['x1'] >= occupied['x2'] or   # test is completely to the right
-                   test_rect['y2'] <= occupied['y1'] or   # test is completely above
-                   test_rect['y1'] >= occupied['y2']):    # test is completely below
-                return False  # Overlap detected
-        
-        return True  # No overlaps found
+        # Overlap test against the occupied areas is delegated to the spatial index
+        return not self.spatial_index.intersects(
+            x - self.MARGIN,
+            y - self.MARGIN,
+            x + width + self.MARGIN,
+            y + height + self.MARGIN
+        )
     
     def verify_no_overlaps(self):
         """Verify that no tables actually overlap in their final positions"""
@@ -363,6 +664,11 @@ class SchemaGenerator:
         table_of_tables = []
         table_id_map = {}  # table_name -> ID mapping
         id_table_map = {}  # ID -> table mapping
+        self.table_entries = {}  # table_name -> table_of_tables entry
+        
+        if self.graph is None:
+            self.calculate_table_connections()
+        graph = self.graph
         
         # Build table_of_tables
         for table_id, (table_name, table) in enumerate(self.tables.items(), 1):
@@ -386,6 +692,7 @@ class SchemaGenerator:
                 'is_placed': False
             }
             table_of_tables.append(table_entry)
+            self.table_entries[table_name] = table_entry
         
         # Fill connections_str with IDs
         for entry in table_of_tables:
@@ -403,20 +710,15 @@ class SchemaGenerator:
             single_children = []
             entry_name = entry['table_name']
             
-            for potential_child in table_of_tables:
-                if potential_child['connections_num'] == 1:
-                    child_name = potential_child['table_name']
-                    
-                    # Check both directions for parent-child relationship:
-                    # 1. Child connects TO this entry (child has outgoing FK to this table)
-                    is_child_outgoing = entry_name in potential_child['connected_names']
-                    
-                    # 2. This entry connects TO child (child has incoming FK from this table)  
-                    is_child_incoming = child_name in entry['connected_names']
-                    
-                    if is_child_outgoing or is_child_incoming:
-                        single_children.append(child_name)
-                        print(f"  Found single child: {child_name} -> parent: {entry_name}")
+            # Candidates are the tables connected in either direction:
+            # 1. Child connects TO this entry (child has outgoing FK to this table)
+            # 2. This entry connects TO child (child has incoming FK from this table)
+            # Keep table_of_tables order so placement stays deterministic
+            candidates = sorted(graph.neighbors(entry_name), key=table_id_map.__getitem__)
+            for child_name in candidates:
+                if self.table_entries[child_name]['connections_num'] == 1:
+                    single_children.append(child_name)
+                    print(f"  Found single child: {child_name} -> parent: {entry_name}")
             
             entry['single_children'] = single_children
             entry['single_children_str'] = ', '.join(sorted(single_children)) if single_children else ''
@@ -445,6 +747,9 @@ class SchemaGenerator:
         # Sort by connections_num descending, then by table name for consistency
         table_of_tables.sort(key=lambda x: (x['connections_num'], x['table_name']), reverse=True)
         
+        # Position of each entry in the sorted table_of_tables; lower positions win ties
+        entry_positions = {e['table_name']: position for position, e in enumerate(table_of_tables)}
+        
         print(f"Created table_of_tables with {len(table_of_tables)} entries")
         print(f"Using cutoff value: {cutoff}")
         
@@ -479,45 +784,74 @@ class SchemaGenerator:
             # Place all direct children of FLAG table
             tables_placed = self.place_direct_children(flag_table, table_of_tables, tables_placed, max_tables_to_place)
         
+        # Cursor over the sorted table_of_tables pointing at the first unplaced main table.
+        # Entries never become unplaced again, so the cursor only moves forward.
+        main_cursor = 0
+        
+        def next_main_entry():
+            nonlocal main_cursor
+            while main_cursor < len(table_of_tables):
+                entry = table_of_tables[main_cursor]
+                if not entry['is_placed'] and entry['connections_num'] > 1:
+                    return entry
+                main_cursor += 1
+            return None
+        
+        # Phase A candidates: heap of (-connections to FLAG, position in table_of_tables, name)
+        # for the unplaced neighbours of the current FLAG table. Popping the smallest key
+        # yields the same table the former full scan picked (most FLAG connections, then
+        # most total connections, then table_of_tables order).
+        candidate_heap = []
+        heap_flag_name = None
+        
         # Step 2: Continue placement with iterative clustering until all tables are placed
         # Repeat main loop until no more unplaced non-orphan tables remain
         while tables_placed < max_tables_to_place:
             # Check if there are any unplaced non-orphan, non-single-child tables
-            unplaced_main_tables = [e for e in table_of_tables 
-                                  if not e['is_placed'] and e['connections_num'] > 1]
-            
-            if not unplaced_main_tables:
+            if next_main_entry() is None:
                 break  # No more main tables to place
             
             # Phase A: Place tables connected to existing FLAG table
             placed_in_this_iteration = 0
             
             if flag_table:
+                flag_name = flag_table['table_name']
+                if heap_flag_name != flag_name:
+                    # New FLAG table: seed the heap with its unplaced neighbours
+                    heap_flag_name = flag_name
+                    candidate_heap = []
+                    for neighbor_name in graph.neighbors(flag_name):
+                        entry = self.table_entries[neighbor_name]
+                        if entry['is_placed'] or entry['connections_num'] <= 1:  # Skip single children
+                            continue
+                        # Count connections to FLAG table (bi-directional)
+                        connections_to_flag = 0
+                        
+                        # Check if this table connects to FLAG table (outgoing)
+                        if flag_name in graph.outgoing[neighbor_name]:
+                            connections_to_flag += 1
+                        
+                        # Check if FLAG table connects to this table (incoming)
+                        if neighbor_name in graph.outgoing[flag_name]:
+                            connections_to_flag += 1
+                        
+                        candidate_heap.append((-connections_to_flag, entry_positions[neighbor_name], neighbor_name))
+                    heapq.heapify(candidate_heap)
+                
                 while tables_placed < max_tables_to_place:
                     # Find unplaced table with most connections to the FLAG table
                     # Skip single children (they will be placed with their parents)
                     best_candidate = None
                     best_connection_count = 0
                     
-                    for entry in table_of_tables:
-                        if not entry['is_placed'] and entry['connections_num'] > 1:  # Skip single children
-                            # Count connections to FLAG table (bi-directional)
-                            connections_to_flag = 0
-                            
-                            # Check if this table connects to FLAG table (outgoing)
-                            if flag_table['table_name'] in entry['connected_names']:
-                                connections_to_flag += entry['connected_names'].count(flag_table['table_name'])
-                            
-                            # Check if FLAG table connects to this table (incoming)
-                            if entry['table_name'] in flag_table['connected_names']:
-                                connections_to_flag += flag_table['connected_names'].count(entry['table_name'])
-                            
-                            # Use total connections as tiebreaker
-                            if (connections_to_flag > best_connection_count or 
-                                (connections_to_flag == best_connection_count and 
-                                 (best_candidate is None or entry['connections_num'] > best_candidate['connections_num']))):
-                                best_candidate = entry
-                                best_connection_count = connections_to_flag
+                    # Entries placed in the meantime are dropped lazily
+                    while candidate_heap:
+                        negative_count, _, candidate_name = heapq.heappop(candidate_heap)
+                        entry = self.table_entries[candidate_name]
+                        if not entry['is_placed']:
+                            best_candidate = entry
+                            best_connection_count = -negative_count
+                            break
                     
                     # If we found a candidate with FLAG connections, place it
                     if best_candidate and best_connection_count > 0:
@@ -550,11 +884,8 @@ class SchemaGenerator:
             # Phase B: If no tables were placed in Phase A, start a new cluster
             if placed_in_this_iteration == 0:
                 # Find unplaced table with most connections as new cluster center
-                best_candidate = None
-                for entry in table_of_tables:
-                    if not entry['is_placed'] and entry['connections_num'] > 1:  # Skip single children
-                        if best_candidate is None or entry['connections_num'] > best_candidate['connections_num']:
-                            best_candidate = entry
+                # (table_of_tables is sorted by connections, so this is the cursor entry)
+                best_candidate = next_main_entry()
                 
                 if best_candidate:
                     table_obj = best_candidate['table_obj']
@@ -604,14 +935,14 @@ class SchemaGenerator:
                 # 1. If child connects TO parent (child has outgoing FK)
                 if child_entry['connected_names']:
                     parent_name = child_entry['connected_names'][0]
-                    parent_entry = next((e for e in table_of_tables if e['table_name'] == parent_name), None)
+                    parent_entry = self.table_entries.get(parent_name)
                 
                 # 2. If parent connects TO child (child has incoming FK only)
                 if not parent_entry:
-                    for potential_parent in table_of_tables:
-                        if child_name in potential_parent['connected_names']:
-                            parent_entry = potential_parent
-                            break
+                    referencing = graph.incoming.get(child_name)
+                    if referencing:
+                        parent_name = min(referencing, key=entry_positions.__getitem__)
+                        parent_entry = self.table_entries[parent_name]
                 
                 if parent_entry and parent_entry['is_placed']:
                     # Group by parent
@@ -766,7 +1097,7 @@ class SchemaGenerator:
                     if 'single_children_list' in remaining_entry and remaining_entry['single_children_list']:
                         child_y = y + table_obj.height
                         for child_name in remaining_entry['single_children_list']:
-                            child_entry = next(e for e in table_of_tables if e['table_name'] == child_name)
+                            child_entry = self.table_entries[child_name]
                             if not child_entry['is_placed'] and tables_placed < max_tables_to_place:
                                 child_table = child_entry['table_obj']
                                 child_table.x = x
@@ -895,7 +1226,7 @@ class SchemaGenerator:
         # Find all unplaced single children entries  
         direct_children = []
         for child_name in single_children_names:
-            child_entry = next((e for e in table_of_tables if e['table_name'] == child_name), None)
+            child_entry = self.table_entries.get(child_name)
             if child_entry and not child_entry['is_placed']:
                 direct_children.append(child_entry)
         
@@ -964,20 +1295,14 @@ class SchemaGenerator:
         center_x, center_y = self.center_x, self.center_y
         
         # Try positions in expanding rings around center with fine granularity
-        for radius in range(0, max(self.canvas_width, self.canvas_height), 25):  # Smaller radius steps
-            for angle in range(0, 360, 4):  # Much finer angle steps (90 positions per ring)
-                rad = math.radians(angle)
-                test_x = int(center_x + radius * math.cos(rad))
-                test_y = int(center_y + radius * math.sin(rad))
-                
-                # Ensure the stack fits within canvas bounds
-                if (10 <= test_x <= self.canvas_width - stack_width - 10 and 
-                    10 <= test_y <= self.canvas_height - stack_height - 10):
-                    
-                    # Check if this entire area is free
-                    if self.is_area_free(test_x, test_y, stack_width, stack_height):
-                        print(f"        Found free location at ({test_x}, {test_y})")
-                        return test_x, test_y
+        # (smaller radius steps, 4 degree angle steps = 90 positions per ring);
+        # the stack must fit within canvas bounds and the entire area must be free
+        position = self.find_first_free_on_rings(
+            center_x, center_y, range(0, max(self.canvas_width, self.canvas_height), 25), 4,
+            stack_width, stack_height)
+        if position:
+            print(f"        Found free location at ({position[0]}, {position[1]})")
+            return position
         
         # If no space found in current canvas, expand and place at edge
         print(f"        No free location found, expanding canvas")
@@ -1032,17 +1357,12 @@ class SchemaGenerator:
         center_x, center_y = self.center_x, self.center_y
         
         # Try positions in expanding rings around center with fine granularity
-        for radius in range(0, max(self.canvas_width, self.canvas_height), 20):  # Smaller radius steps
-            for angle in range(0, 360, 3):  # Much finer angle steps (120 positions per ring)
-                rad = math.radians(angle)
-                test_x = int(center_x + radius * math.cos(rad))
-                test_y = int(center_y + radius * math.sin(rad))
-                
-                # Check if position is within canvas and free
-                if (10 <= test_x <= self.canvas_width - table_width - 10 and 
-                    10 <= test_y <= self.canvas_height - table_height - 10):
-                    if self.is_area_free(test_x, test_y, table_width, table_height):
-                        return test_x, test_y
+        # (smaller radius steps, 3 degree angle steps = 120 positions per ring)
+        position = self.find_first_free_on_rings(
+            center_x, center_y, range(0, max(self.canvas_width, self.canvas_height), 20), 3,
+            table_width, table_height)
+        if position:
+            return position
         
         # If no space found, expand canvas and return edge position
         self.canvas_width += 400
@@ -1054,17 +1374,12 @@ class SchemaGenerator:
         anchor_y = anchor_table.y + anchor_table.height // 2
         
         # Try positions in expanding rings around anchor table with fine granularity
-        for radius in range(60, max(self.canvas_width, self.canvas_height), 15):  # Smaller radius steps
-            for angle in range(0, 360, 2):  # Much finer angle steps (180 positions per ring)
-                rad = math.radians(angle)
-                test_x = int(anchor_x + radius * math.cos(rad))
-                test_y = int(anchor_y + radius * math.sin(rad))
-                
-                # Check if position is within canvas and free
-                if (10 <= test_x <= self.canvas_width - table_width - 10 and 
-                    10 <= test_y <= self.canvas_height - table_height - 10):
-                    if self.is_area_free(test_x, test_y, table_width, table_height):
-                        return test_x, test_y
+        # (smaller radius steps, 2 degree angle steps = 180 positions per ring)
+        position = self.find_first_free_on_rings(
+            anchor_x, anchor_y, range(60, max(self.canvas_width, self.canvas_height), 15), 2,
+            table_width, table_height)
+        if position:
+            return position
         
         # If no space found, expand canvas and place at edge
         if anchor_x > self.canvas_width // 2:
@@ -1078,17 +1393,12 @@ class SchemaGenerator:
         """Find next free position as close as possible to target location"""
         
         # Try positions in expanding rings around target location with fine granularity
-        for radius in range(0, max(self.canvas_width, self.canvas_height), 15):  # Smaller radius steps
-            for angle in range(0, 360, 3):  # Much finer angle steps (120 positions per ring)
-                rad = math.radians(angle)
-                test_x = int(target_x + radius * math.cos(rad))
-                test_y = int(target_y + radius * math.sin(rad))
-                
-                # Check if position is within canvas and free
-                if (10 <= test_x <= self.canvas_width - table_width - 10 and 
-                    10 <= test_y <= self.canvas_height - table_height - 10):
-                    if self.is_area_free(test_x, test_y, table_width, table_height):
-                        return test_x, test_y
+        # (smaller radius steps, 3 degree angle steps = 120 positions per ring)
+        position = self.find_first_free_on_rings(
+            target_x, target_y, range(0, max(self.canvas_width, self.canvas_height), 15), 3,
+            table_width, table_height)
+        if position:
+            return position
         
         # If no space found, expand canvas and return edge position
         self.canvas_width += 400
@@ -1103,7 +1413,10 @@ class SchemaGenerator:
             table_center_x = table.x + table.width // 2
             table_center_y = table.y + table.height // 2
             
-            connected_names = table.get_connected_tables()
+            if self.graph is not None:
+                connected_names = self.graph.outgoing.get(table.name, ())
+            else:
+                connected_names = table.get_connected_tables()
             for connected_name in connected_names:
                 if connected_name in self.tables:
                     # Avoid double counting connections
@@ -1147,35 +1460,43 @@ class SchemaGenerator:
         grid_size = 80  # Grid size for search
         
         # First try a systematic search across the current canvas
-        for y in range(10, canvas_height - table.height, grid_size):
-            for x in range(10, canvas_width - table.width, grid_size):
-                if self.is_area_free(x, y, table.width, table.height):
-                    return x, y
+        position = self.find_first_free_in_grid(
+            range(10, canvas_width - table.width, grid_size),
+            range(10, canvas_height - table.height, grid_size),
+            table.width, table.height)
+        if position:
+            return position
         
         # If no space found, expand the canvas area and try extended regions
         # Try extending to the right
         extended_width = canvas_width + 800
-        for y in range(10, canvas_height - table.height, grid_size):
-            for x in range(canvas_width, extended_width - table.width, grid_size):
-                if self.is_area_free(x, y, table.width, table.height):
-                    self.canvas_width = extended_width  # Update canvas size
-                    return x, y
+        position = self.find_first_free_in_grid(
+            range(canvas_width, extended_width - table.width, grid_size),
+            range(10, canvas_height - table.height, grid_size),
+            table.width, table.height)
+        if position:
+            self.canvas_width = extended_width  # Update canvas size
+            return position
         
         # Try extending downward
         extended_height = canvas_height + 600
-        for y in range(canvas_height, extended_height - table.height, grid_size):
-            for x in range(10, canvas_width - table.width, grid_size):
-                if self.is_area_free(x, y, table.width, table.height):
-                    self.canvas_height = extended_height  # Update canvas size
-                    return x, y
+        position = self.find_first_free_in_grid(
+            range(10, canvas_width - table.width, grid_size),
+            range(canvas_height, extended_height - table.height, grid_size),
+            table.width, table.height)
+        if position:
+            self.canvas_height = extended_height  # Update canvas size
+            return position
         
         # Try extending both directions
-        for y in range(canvas_height, extended_height - table.height, grid_size):
-            for x in range(canvas_width, extended_width - table.width, grid_size):
-                if self.is_area_free(x, y, table.width, table.height):
-                    self.canvas_width = extended_width
-                    self.canvas_height = extended_height
-                    return x, y
+        position = self.find_first_free_in_grid(
+            range(canvas_width, extended_width - table.width, grid_size),
+            range(canvas_height, extended_height - table.height, grid_size),
+            table.width, table.height)
+        if position:
+            self.canvas_width = extended_width
+            self.canvas_height = extended_height
+            return position
         
         # Final fallback: place at expanded edge with unique position
         fallback_x = extended_width - table.width - 20
@@ -1187,22 +1508,22 @@ class SchemaGenerator:
     def find_free_location_bottom_left(self, width, height, start_x, start_y):
         """Find a free location starting from bottom-left corner, growing right and up"""
         # Start from bottom-left and search right, then up
-        for y in range(start_y - height, 10, -50):  # Move up in steps
-            for x in range(start_x, self.canvas_width - width - 10, 50):  # Move right in steps
-                # Check if position is within canvas bounds
-                if (10 <= x <= self.canvas_width - width - 10 and 
-                    10 <= y <= self.canvas_height - height - 10):
-                    # Check if this area is free
-                    if self.is_area_free(x, y, width, height):
-                        return x, y
+        # Only positions within canvas bounds are considered
+        x_values = [x for x in range(start_x, self.canvas_width - width - 10, 50) if x >= 10]  # Move right in steps
+        y_values = [y for y in range(start_y - height, 10, -50)  # Move up in steps
+                    if 10 <= y <= self.canvas_height - height - 10]
+        position = self.find_first_free_in_grid(x_values, y_values, width, height)
+        if position:
+            return position
         
         # If no space found in current canvas, expand downward and try again
         self.canvas_height += 400
         new_y = self.canvas_height - height - 20
         
-        for x in range(start_x, self.canvas_width - width - 10, 50):
-            if self.is_area_free(x, new_y, width, height):
-                return x, new_y
+        position = self.find_first_free_in_grid(
+            range(start_x, self.canvas_width - width - 10, 50), [new_y], width, height)
+        if position:
+            return position
         
         # Final fallback - expand both width and height
         self.canvas_width += 400
@@ -1245,11 +1566,19 @@ class SchemaGenerator:
 </datatypes>'''
         return datatypes_xml
     
-    def generate_xml(self, output_file):
-        """Generate the complete XML schema file"""
+    def generate_xml(self, output_file, compress=None):
+        """Generate the complete XML schema file
+        
+        Names are XML-escaped and the output is streamed through a buffered
+        writer table by table. ``compress`` gzips the file; by default it is
+        enabled when the output file name ends with ``.gz``.
+        """
         print(f"Generating XML schema to {output_file}")
         
-        with open(output_file, 'w', encoding='utf-8') as f:
+        if compress is None:
+            compress = output_file.endswith('.gz')
+        
+        with XmlStreamWriter(output_file, compress=compress) as f:
             # XML header
             f.write('<?xml version="1.0" encoding="utf-8" ?>\n')
             f.write('<!-- SQL XML created by keys_2_schema.py -->\n')
@@ -1262,17 +1591,18 @@ class SchemaGenerator:
             # Write tables (sorted by connection count for better readability)
             sorted_tables = sorted(self.tables.items(), key=lambda x: x[1].connections, reverse=True)
             for table_name, table in sorted_tables:
-                f.write(f'<table x="{int(table.x)}" y="{int(table.y)}" name="{table_name}">\n')
+                f.write(f'<table x="{int(table.x)}" y="{int(table.y)}" name="{xml_attr(table_name)}">\n')
                 
                 # Write columns (rows)
                 for column_name, column in table.columns.items():
-                    f.write(f'<row name="{column_name}" null="{column.null}" autoincrement="{column.autoincrement}">\n')
-                    f.write(f'<datatype>{column.datatype}</datatype>\n')
-                    f.write(f'<default>{column.default}</default>')
+                    f.write(f'<row name="{xml_attr(column_name)}" null="{xml_attr(column.null)}" '
+                            f'autoincrement="{xml_attr(column.autoincrement)}">\n')
+                    f.write(f'<datatype>{xml_text(column.datatype)}</datatype>\n')
+                    f.write(f'<default>{xml_text(column.default)}</default>')
                     
                     # Write foreign key relations
                     for ref_table, ref_column in column.foreign_keys:
-                        f.write(f'<relation table="{ref_table}" row="{ref_column}" />\n')
+                        f.write(f'<relation table="{xml_attr(ref_table)}" row="{xml_attr(ref_column)}" />\n')
                     
                     f.write('</row>\n')
                 
@@ -1282,7 +1612,7 @@ class SchemaGenerator:
                     # Sort primary keys by order
                     sorted_pk = sorted(table.primary_keys, key=lambda x: x[1])
                     for column_name, order in sorted_pk:
-                        f.write(f'<part>{column_name}</part>\n')
+                        f.write(f'<part>{xml_text(column_name)}</part>\n')
                     f.write('</key>\n')
                 
                 f.write('</table>\n')
@@ -1352,6 +1682,11 @@ def select_csv_folder(csv_folders):
 
 def main():
     """Main function to generate schema from CSV files"""
+    parser = argparse.ArgumentParser(description='Generate a WWW SQL Designer schema XML from key CSV files.')
+    parser.add_argument('--gzip', action='store_true',
+                        help='write <dataset>-schema.xml.gz (gzip-compressed) instead of <dataset>-schema.xml')
+    args = parser.parse_args()
+
     # File paths
     script_dir = os.path.dirname(os.path.abspath(__file__))
     base_dir = os.path.dirname(script_dir)  
@@ -1367,7 +1702,7 @@ def main():
     foreign_keys_file = selected_entry['foreign']
     # Write the schema XML next to the source CSV files
     output_dir = selected_entry['path']
-    output_filename = f'{folder_name}-schema.xml'
+    output_filename = f'{folder_name}-schema.xml' + ('.gz' if args.gzip else '')
     output_file = os.path.join(output_dir, output_filename)
     
     # Verify input files exist
@@ -1393,7 +1728,7 @@ def main():
     generator.read_primary_keys()
     generator.read_foreign_keys()
     generator.position_tables_intelligently()
-    generator.generate_xml(output_file)
+    generator.generate_xml(output_file, compress=args.gzip)
     
     print("=== Schema generation completed ===")
 
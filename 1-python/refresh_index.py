@@ -1,14 +1,26 @@
 import os
+import sys
 import csv
+import json
+import heapq
+import hashlib
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-def collect_column_names():
-    """Collect the column catalogue rows and emit a comma-delimited index.csv."""
-    data_folder = Path('0-data')
-    all_rows = set()
-    header_row = None
-    
-    # Walk through all subdirectories in 0-data/
+from column_catalog import INDEX_FIELDS, ColumnCatalog, file_digest, iter_columns_csv, load_columns_csv
+
+DATA_FOLDER = Path('0-data')
+MANIFEST_NAME = 'index.manifest.json'
+SEGMENT_FOLDER = '.index-segments'
+# Upper bound of spilled runs merged at once (each one holds an open file)
+MAX_MERGE_FANIN = 64
+
+
+def find_column_files(data_folder):
+    """Return (source schema, relative path, path) for every columns.csv below data_folder."""
+    column_files = []
     for root, dirs, files in os.walk(data_folder):
         if 'columns.csv' in files:
             csv_path = Path(root) / 'columns.csv'
@@ -21,60 +33,304 @@ def collect_column_names():
 
             if not schema_name:
                 continue
-            
-            # Read column names from each columns.csv
-            try:
-                with open(csv_path, 'r', newline='', encoding='utf-8') as f:
-                    first_line = f.readline()
-                    if not first_line:
-                        continue
 
-                    comma_count = first_line.count(',')
-                    tab_count = first_line.count('\t')
-                    delimiter = '\t' if tab_count >= comma_count else ','
+            column_files.append((schema_name, csv_path.relative_to(data_folder).as_posix(), csv_path))
+    return column_files
+
+
+def read_sorted_rows(csv_path, schema_name):
+    """Parse one columns.csv into (header, sorted unique rows prefixed with the source schema)."""
+    catalog = load_columns_csv(str(csv_path), schema_name, ColumnCatalog(keep_extra=True))
+    catalog.sort_unique()
+    return catalog.header, list(catalog.records())
+
+
+def parse_column_files(column_files, jobs=1):
+    """Parse columns.csv files into sorted, de-duplicated chunks.
+
+    With jobs > 1 the files are parsed in a process pool. Returns a dict
+    relative path -> (header, rows) for every file that could be read.
+    """
+    results = {}
+    if jobs > 1 and len(column_files) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                (relative_path, csv_path, executor.submit(read_sorted_rows, csv_path, schema_name))
+                for schema_name, relative_path, csv_path in column_files
+            ]
+            for relative_path, csv_path, future in futures:
+                try:
+                    results[relative_path] = future.result()
+                except Exception as e:
+                    print(f"Error reading {csv_path}: {e}")
+        return results
+
+    for schema_name, relative_path, csv_path in column_files:
+        try:
+            results[relative_path] = read_sorted_rows(csv_path, schema_name)
+        except Exception as e:
+            print(f"Error reading {csv_path}: {e}")
+    return results
+
+
+def merge_sorted_rows(runs):
+    """Merge already sorted row iterables, dropping duplicates across runs."""
+    previous = None
+    for row in heapq.merge(*runs):
+        if row != previous:
+            yield row
+            previous = row
+
+
+def write_index(output_path, header_row, rows):
+    """Write header and rows to index.csv; returns the number of rows written."""
+    if header_row is None:
+        header_row = list(INDEX_FIELDS)
+
+    count = 0
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter=',')
+        writer.writerow(header_row)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def collect_column_names(jobs=1):
+    """Collect the column catalogue rows and emit a comma-delimited index.csv.
+
+    With jobs > 1 every columns.csv is parsed into a sorted chunk in its own
+    worker process and the chunks are k-way merged into index.csv.
+    """
+    data_folder = DATA_FOLDER
+    output_path = data_folder / 'index.csv'
+
+    if jobs > 1:
+        column_files = find_column_files(data_folder)
+        chunks = parse_column_files(column_files, jobs)
+        header_row = next((chunks[relative_path][0] for _, relative_path, _ in column_files
+                           if relative_path in chunks and chunks[relative_path][0]), None)
+        try:
+            count = write_index(output_path, header_row, merge_sorted_rows(rows for _, rows in chunks.values()))
+            print(f"Successfully wrote {count} unique columns to {output_path}")
+        except Exception as e:
+            print(f"Error writing to {output_path}: {e}")
+        return
+
+    # One catalog for all databases so identical strings are stored only once;
+    # keep_extra carries columns beyond the index layout into index.csv
+    catalog = ColumnCatalog(keep_extra=True)
+
+    # Walk through all subdirectories in 0-data/
+    for schema_name, relative_path, csv_path in find_column_files(data_folder):
+        # Read column names from each columns.csv
+        try:
+            load_columns_csv(str(csv_path), schema_name, catalog)
+        except Exception as e:
+            print(f"Error reading {csv_path}: {e}")
+
+    # Write collected column names to index.csv
+    try:
+        catalog.sort_unique()
+        count = write_index(output_path, catalog.header, catalog.records())
+        print(f"Successfully wrote {count} unique columns to {output_path}")
+    except Exception as e:
+        print(f"Error writing to {output_path}: {e}")
+
+
+def _estimate_row_size(row):
+    """Rough in-memory size of a row tuple in bytes."""
+    return sys.getsizeof(row) + sum(sys.getsizeof(cell) for cell in row)
+
 
-                    f.seek(0)
-                    reader = csv.reader(f, delimiter=delimiter)
-                    for row in reader:
-                        cleaned_row = [col.strip() for col in row]
-                        if not any(cleaned_row):
-                            continue
+def _spill_run(run_folder, rows):
+    """Sort and de-duplicate rows, write them to a new run file and return its path."""
+    rows.sort()
+    handle, path = tempfile.mkstemp(suffix='.run.csv', dir=run_folder)
+    with os.fdopen(handle, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(merge_sorted_rows([rows]))
+    return path
 
-                        if cleaned_row[0].lower() == 'table_schema':
-                            if header_row is None:
-                                header_row = ['SOURCE_SCHEMA'] + cleaned_row
-                            continue
 
-                        all_rows.add(tuple([schema_name] + cleaned_row))
+def _merge_runs(run_folder, run_paths):
+    """Reduce the number of runs to MAX_MERGE_FANIN by merging them in groups."""
+    while len(run_paths) > MAX_MERGE_FANIN:
+        merged_paths = []
+        for start in range(0, len(run_paths), MAX_MERGE_FANIN):
+            group = run_paths[start:start + MAX_MERGE_FANIN]
+            handle, path = tempfile.mkstemp(suffix='.run.csv', dir=run_folder)
+            with os.fdopen(handle, 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerows(merge_sorted_rows([_read_segment(run) for run in group]))
+            for run in group:
+                os.remove(run)
+            merged_paths.append(path)
+        run_paths = merged_paths
+    return run_paths
+
+
+def collect_column_names_streaming(memory_budget_mb):
+    """Build index.csv with an external sort whose row buffer stays below memory_budget_mb.
+
+    Rows are buffered until the estimated size reaches the budget, then spilled
+    as a sorted, de-duplicated run to a temporary folder inside 0-data. All runs
+    are finally heap-merged into index.csv.
+    """
+    data_folder = DATA_FOLDER
+    output_path = data_folder / 'index.csv'
+    budget = int(memory_budget_mb * 1024 * 1024)
+
+    with tempfile.TemporaryDirectory(prefix='.index-runs-', dir=data_folder) as run_folder:
+        run_paths = []
+        buffer = []
+        buffered = 0
+        header_row = None
+
+        for schema_name, relative_path, csv_path in find_column_files(data_folder):
+            try:
+                for is_header, row in iter_columns_csv(str(csv_path), schema_name):
+                    if is_header:
+                        if header_row is None:
+                            header_row = row
+                        continue
+                    row = tuple(row)
+                    buffer.append(row)
+                    buffered += _estimate_row_size(row)
+                    if buffered >= budget:
+                        run_paths.append(_spill_run(run_folder, buffer))
+                        buffer = []
+                        buffered = 0
             except Exception as e:
                 print(f"Error reading {csv_path}: {e}")
-    
-    # Write collected column names to index.csv
+
+        buffer.sort()
+        run_paths = _merge_runs(run_folder, run_paths)
+        try:
+            runs = [_read_segment(path) for path in run_paths] + [iter(buffer)]
+            count = write_index(output_path, header_row, merge_sorted_rows(runs))
+            print(f"Successfully wrote {count} unique columns to {output_path} ({len(run_paths)} spilled runs)")
+        except Exception as e:
+            print(f"Error writing to {output_path}: {e}")
+
+
+def _segment_path(segment_folder, relative_path):
+    """Segment file name for a columns.csv path relative to 0-data (SHA-1 of the path, so names never collide)."""
+    return segment_folder / (hashlib.sha1(relative_path.encode('utf-8')).hexdigest() + '.segment.csv')
+
+
+def _read_segment(path):
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            yield tuple(row)
+
+
+def refresh_incremental(jobs=1):
+    """Re-parse only changed columns.csv files and merge per-file segments into index.csv.
+
+    A manifest (0-data/index.manifest.json) records size, mtime and SHA-1 of
+    every columns.csv together with its sorted, de-duplicated segment in
+    0-data/.index-segments/. Unchanged files reuse their segment; index.csv is
+    then rebuilt by streaming a k-way merge over all segments. Changed files
+    are parsed in a process pool when jobs > 1.
+    """
+    data_folder = DATA_FOLDER
+    manifest_path = data_folder / MANIFEST_NAME
+    segment_folder = data_folder / SEGMENT_FOLDER
+    segment_folder.mkdir(exist_ok=True)
+
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    old_files = manifest.get('files', {})
+
+    column_files = find_column_files(data_folder)
+    new_files = {}
+    changed_files = []
+    for schema_name, relative_path, csv_path in column_files:
+        segment = _segment_path(segment_folder, relative_path)
+        stat = csv_path.stat()
+        entry = old_files.get(relative_path)
+
+        if entry and entry.get('source') == schema_name and segment.exists():
+            if entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                new_files[relative_path] = entry
+            elif entry['size'] == stat.st_size and entry['sha1'] == file_digest(str(csv_path)):
+                entry['mtime_ns'] = stat.st_mtime_ns
+                new_files[relative_path] = entry
+
+        if relative_path not in new_files:
+            changed_files.append((schema_name, relative_path, csv_path))
+
+    chunks = parse_column_files(changed_files, jobs)
+    reparsed = 0
+    for schema_name, relative_path, csv_path in changed_files:
+        if relative_path not in chunks:
+            continue
+        file_header, rows = chunks.pop(relative_path)
+        with open(_segment_path(segment_folder, relative_path), 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows(rows)
+        stat = csv_path.stat()
+        new_files[relative_path] = {
+            'source': schema_name,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha1': file_digest(str(csv_path)),
+            'header': file_header,
+            'rows': len(rows),
+        }
+        reparsed += 1
+        print(f"Re-indexed {relative_path} ({len(rows)} rows)")
+
+    header_row = next((new_files[relative_path]['header'] for _, relative_path, _ in column_files
+                       if relative_path in new_files and new_files[relative_path].get('header')), None)
+
+    # Drop segments of columns.csv files that no longer exist (or were written under another name)
+    current_segments = {_segment_path(segment_folder, relative_path).name for relative_path in new_files}
+    for segment in segment_folder.glob('*.segment.csv'):
+        if segment.name not in current_segments:
+            try:
+                segment.unlink()
+            except OSError:
+                pass
+
     output_path = data_folder / 'index.csv'
     try:
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f, delimiter=',')
-            sorted_rows = sorted(all_rows)
-
-            if header_row is None:
-                header_row = [
-                    'SOURCE_SCHEMA',
-                    'TABLE_SCHEMA',
-                    'TABLE_NAME',
-                    'COLUMN_NAME',
-                    'DATA_TYPE',
-                    'CHARACTER_MAXIMUM_LENGTH',
-                    'IS_NULLABLE',
-                ]
-
-            writer.writerow(header_row)
-
-            for row in sorted_rows:
-                writer.writerow(row)
-        
-        print(f"Successfully wrote {len(all_rows)} unique columns to {output_path}")
+        runs = [_read_segment(_segment_path(segment_folder, relative_path)) for relative_path in new_files]
+        count = write_index(output_path, header_row, merge_sorted_rows(runs))
     except Exception as e:
         print(f"Error writing to {output_path}: {e}")
+        return
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({'files': new_files}, f, indent=1, sort_keys=True)
+
+    print(f"Re-parsed {reparsed} of {len(new_files)} columns.csv files")
+    print(f"Successfully wrote {count} unique columns to {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild 0-data/index.csv from every 0-data/<database>/columns.csv.')
+    parser.add_argument('--incremental', action='store_true',
+                        help='only re-read columns.csv files that changed since the last incremental run')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='parse columns.csv files in N worker processes (default 1)')
+    parser.add_argument('--memory-budget', type=float, metavar='MB',
+                        help='full rebuild as an external sort, spilling sorted runs to disk beyond MB of buffered rows')
+    args = parser.parse_args()
+
+    if args.memory_budget is not None:
+        if args.incremental or args.jobs > 1:
+            parser.error('--memory-budget cannot be combined with --incremental or --jobs')
+        if args.memory_budget <= 0:
+            parser.error('--memory-budget must be positive')
+        collect_column_names_streaming(args.memory_budget)
+    elif args.incremental:
+        refresh_incremental(args.jobs)
+    else:
+        collect_column_names(args.jobs)
+
 
 if __name__ == '__main__':
-    collect_column_names()
\ No newline at end of file
+    main()
@@ -0,0 +1,33 @@
+/*
+Table statistics for join_cols.py cost-based join planning.
+Goal: one row per user table with its row count and the leading columns of its
+      indexes, saved as 0-data/<DATABASE_NAME>/table-stats.csv (TAB-delimited, with header).
+
+Columns:
+  TableName      - table name (schema prefix is ignored by join_cols.py)
+  RowCount       - rows in the heap or clustered index (sys.partitions, no table scan)
+  IndexedColumns - ';'-separated leading key column of every index on the table
+*/
+
+SET NOCOUNT ON;
+
+SELECT
+    t.name AS TableName,
+    (
+        SELECT SUM(p.rows)
+        FROM sys.partitions AS p
+        WHERE p.object_id = t.object_id
+          AND p.index_id IN (0, 1)
+    ) AS [RowCount],
+    (
+        SELECT STRING_AGG(CAST(c.name AS NVARCHAR(MAX)), ';')
+        FROM sys.index_columns AS ic
+        JOIN sys.columns AS c
+          ON c.object_id = ic.object_id
+         AND c.column_id = ic.column_id
+        WHERE ic.object_id = t.object_id
+          AND ic.key_ordinal = 1
+    ) AS IndexedColumns
+FROM sys.tables AS t
+WHERE t.is_ms_shipped = 0
+ORDER BY t.name;